@@ -208,23 +208,35 @@ class CacheService:
             return {"status": "unavailable"}
 
         try:
-            info = self.client.info('stats')
-            return {
-                "status": "available",
-                "total_commands": info.get('total_commands_processed', 0),
-                "keyspace_hits": info.get('keyspace_hits', 0),
-                "keyspace_misses": info.get('keyspace_misses', 0),
-                "hit_rate": round(
-                    info.get('keyspace_hits', 0) /
-                    (info.get('keyspace_hits', 0) + info.get('keyspace_misses', 1)) * 100,
-                    2
-                )
-            }
+            return format_cache_stats(self.client.info('stats'))
         except Exception as e:
             logger.error(f"Cache stats error: {e}")
             return {"status": "error", "error": str(e)}
 
 
+def format_cache_stats(info: dict) -> dict:
+    """
+    Build cache statistics from a Redis INFO stats section
+
+    Args:
+        info: Parsed output of INFO stats
+
+    Returns:
+        Dictionary with cache statistics
+    """
+    return {
+        "status": "available",
+        "total_commands": info.get('total_commands_processed', 0),
+        "keyspace_hits": info.get('keyspace_hits', 0),
+        "keyspace_misses": info.get('keyspace_misses', 0),
+        "hit_rate": round(
+            info.get('keyspace_hits', 0) /
+            (info.get('keyspace_hits', 0) + info.get('keyspace_misses', 1)) * 100,
+            2
+        )
+    }
+
+
 # Global cache instance
 _cache_service = None
 
@@ -3,73 +3,325 @@ Monitoring and observability for SmartAmazon API
 
 Provides Prometheus metrics, health checks, and performance monitoring
 """
-from prometheus_client import Counter, Histogram, Gauge, generate_latest, CONTENT_TYPE_LATEST
+from prometheus_client import (
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    Gauge,
+    generate_latest,
+    CONTENT_TYPE_LATEST
+)
 from fastapi import Response, Request
+from sqlalchemy import text
+from sqlalchemy.orm import scoped_session
 from starlette.middleware.base import BaseHTTPMiddleware
-from typing import Callable
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, Callable, Dict, Tuple
 import time
 import psutil
 import os
+import sys
+import redis
 
+from .cache import get_cache, format_cache_stats
+from .database import SessionLocal
 from .logging_config import get_logger
 
 
 logger = get_logger(__name__)
 
 
+# Registry holding only the application's own metrics
+APP_REGISTRY = CollectorRegistry()
+
 # Prometheus Metrics
 http_requests_total = Counter(
     'http_requests_total',
     'Total HTTP requests',
-    ['method', 'endpoint', 'status']
+    ['method', 'endpoint', 'status'],
+    registry=APP_REGISTRY
 )
 
 http_request_duration_seconds = Histogram(
     'http_request_duration_seconds',
     'HTTP request latency',
-    ['method', 'endpoint']
+    ['method', 'endpoint'],
+    registry=APP_REGISTRY
 )
 
 active_requests = Gauge(
     'active_requests',
-    'Number of active requests'
+    'Number of active requests',
+    registry=APP_REGISTRY
 )
 
 database_queries_total = Counter(
     'database_queries_total',
     'Total database queries',
-    ['operation']
+    ['operation'],
+    registry=APP_REGISTRY
 )
 
 cache_operations_total = Counter(
     'cache_operations_total',
     'Total cache operations',
-    ['operation', 'status']
+    ['operation', 'status'],
+    registry=APP_REGISTRY
 )
 
 scraper_requests_total = Counter(
     'scraper_requests_total',
     'Total scraper requests',
-    ['status']
+    ['status'],
+    registry=APP_REGISTRY
 )
 
 system_cpu_usage = Gauge(
     'system_cpu_usage_percent',
-    'System CPU usage percentage'
+    'System CPU usage percentage',
+    registry=APP_REGISTRY
 )
 
 system_memory_usage = Gauge(
     'system_memory_usage_percent',
-    'System memory usage percentage'
+    'System memory usage percentage',
+    registry=APP_REGISTRY
+)
+
+system_disk_usage = Gauge(
+    'system_disk_usage_percent',
+    'System disk usage percentage',
+    registry=APP_REGISTRY
+)
+
+worker_memory_usage = Gauge(
+    'worker_memory_usage_percent',
+    'Share of system memory used by this worker process',
+    registry=APP_REGISTRY
 )
 
 application_info = Gauge(
     'application_info',
     'Application information',
-    ['version', 'environment']
+    ['version', 'environment'],
+    registry=APP_REGISTRY
 )
 
 
+# psutil readings are shared between metric scrapes and health checks
+PSUTIL_CACHE_TTL = 1.0
+
+
+@dataclass
+class _PsutilCache:
+    """
+    Short-lived cache of psutil readings keyed by metric name
+    """
+    entries: Dict[str, Tuple[Any, float]] = field(default_factory=dict)
+
+    def get(self, key: str, func: Callable, ttl: float, *args, **kwargs) -> Any:
+        now = time.monotonic()
+        entry = self.entries.get(key)
+        if entry is not None and entry[1] > now:
+            return entry[0]
+
+        value = func(*args, **kwargs)
+        self.entries[key] = (value, now + ttl)
+        return value
+
+    def clear(self):
+        self.entries.clear()
+
+
+_psutil_cache = _PsutilCache()
+
+# Handle on this worker process, reused across scrapes
+_PROC = None
+
+
+def _get_process() -> psutil.Process:
+    """
+    Get the cached psutil handle for the current process
+
+    Returns:
+        psutil.Process for this worker, recreated after a fork
+    """
+    global _PROC
+    if _PROC is None or _PROC.pid != os.getpid():
+        _PROC = psutil.Process()
+    return _PROC
+
+
+def _cached(key: str, func: Callable, *args, ttl: float = PSUTIL_CACHE_TTL, **kwargs) -> Any:
+    """
+    Return a cached psutil reading, refreshing it once the TTL has expired
+
+    Args:
+        key: Cache key for the reading
+        func: psutil function producing the reading
+        ttl: Seconds the reading stays valid
+
+    Returns:
+        The (possibly cached) reading
+    """
+    return _psutil_cache.get(key, func, ttl, *args, **kwargs)
+
+
+@dataclass(frozen=True)
+class _AppMeta:
+    """
+    Application version and environment, read from the environment once
+    """
+    version: str
+    environment: str
+
+    @classmethod
+    def from_env(cls) -> "_AppMeta":
+        return cls(
+            version=os.getenv("APP_VERSION", "1.0.0"),
+            environment=os.getenv("ENVIRONMENT", "development")
+        )
+
+
+APP_META = _AppMeta.from_env()
+
+
+def refresh_app_meta() -> _AppMeta:
+    """
+    Re-read application metadata from the environment
+
+    Returns:
+        The refreshed metadata
+    """
+    global APP_META
+    APP_META = _AppMeta.from_env()
+    return APP_META
+
+
+# Health check status values
+HEALTHY = sys.intern("healthy")
+DEGRADED = sys.intern("degraded")
+UNHEALTHY = sys.intern("unhealthy")
+UNKNOWN = sys.intern("unknown")
+HEALTH_STATUSES = frozenset((HEALTHY, DEGRADED, UNHEALTHY, UNKNOWN))
+
+
+class HealthCode(IntEnum):
+    """Stable machine-readable code attached to every health check result"""
+    OK = 0
+    DEGRADED = 1
+    UNHEALTHY = 2
+    UNKNOWN = 3
+
+
+# Usage above the first threshold is degraded, above the second unhealthy
+USAGE_THRESHOLDS = (80.0, 90.0)
+USAGE_STATUSES = (HEALTHY, DEGRADED, UNHEALTHY)
+USAGE_CODES = (HealthCode.OK, HealthCode.DEGRADED, HealthCode.UNHEALTHY)
+DISK_MESSAGES = (
+    "Disk space OK: {}% used",
+    "Disk space running low: {}% used",
+    "Disk space critically low: {}% used"
+)
+MEMORY_MESSAGES = (
+    "Memory OK: {}% used",
+    "Memory running high: {}% used",
+    "Memory critically high: {}% used"
+)
+
+
+def _usage_result(percent_used: float, messages: tuple) -> dict:
+    """
+    Build a health check result for a usage percentage
+
+    Args:
+        percent_used: Resource usage percentage
+        messages: Message templates indexed like USAGE_STATUSES
+
+    Returns:
+        Health check result
+    """
+    level = bisect_left(USAGE_THRESHOLDS, percent_used)
+    return {
+        "status": USAGE_STATUSES[level],
+        "code": USAGE_CODES[level],
+        "message": messages[level].format(percent_used),
+        "percent_used": percent_used
+    }
+
+
+# Severity rank used to reduce individual check statuses to an overall status
+HEALTH_STATUS_RANK = {
+    HEALTHY: 0,
+    UNKNOWN: 0,
+    DEGRADED: 1,
+    UNHEALTHY: 2
+}
+
+# Connectivity probe statement, built once
+_PING_STMT = text("SELECT 1")
+
+# Session registry for health probes; remove() hands the connection back to the pool
+_health_session = scoped_session(SessionLocal)
+
+# Health probes are I/O-bound, so they run side by side on a shared pool
+_health_check_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="health-check")
+
+
+# Labeled children keyed by (method, endpoint, status). Endpoints are raw
+# request paths, so the cache is capped; paths beyond the cap still record
+# metrics, they just bind their children on every request.
+HTTP_REQUEST_CHILDREN_MAX = 512
+_http_request_children: Dict[Tuple[str, str, int], Tuple[Any, Any]] = {}
+
+
+def _request_children(method: str, endpoint: str, status: int) -> Tuple[Any, Any]:
+    """
+    Get the counter and histogram children for a request, binding them once
+
+    Args:
+        method: HTTP method
+        endpoint: Request path
+        status: Response status code
+
+    Returns:
+        Tuple of (request counter child, duration histogram child)
+    """
+    key = (method, endpoint, status)
+    children = _http_request_children.get(key)
+    if children is None:
+        children = (
+            http_requests_total.labels(method=method, endpoint=endpoint, status=status),
+            http_request_duration_seconds.labels(method=method, endpoint=endpoint)
+        )
+        if len(_http_request_children) < HTTP_REQUEST_CHILDREN_MAX:
+            _http_request_children[key] = children
+    return children
+
+
+def record_request(method: str, endpoint: str, status: int, duration: float):
+    """
+    Record a finished request in the request counter and latency histogram
+
+    Args:
+        method: HTTP method
+        endpoint: Request path
+        status: Response status code
+        duration: Request duration in seconds
+    """
+    requests_child, duration_child = _request_children(method, endpoint, status)
+    requests_child.inc()
+    duration_child.observe(duration)
+
+
+# Probe endpoints are hit constantly, so bind their children up front
+for _endpoint in ("/health", "/health/detailed"):
+    _request_children("GET", _endpoint, 200)
+
+
 class PrometheusMiddleware(BaseHTTPMiddleware):
     """
     Middleware to collect Prometheus metrics for all requests
@@ -91,35 +343,23 @@ class PrometheusMiddleware(BaseHTTPMiddleware):
             response = await call_next(request)
 
             # Record metrics
-            duration = time.time() - start_time
-
-            http_request_duration_seconds.labels(
-                method=request.method,
-                endpoint=request.url.path
-            ).observe(duration)
-
-            http_requests_total.labels(
-                method=request.method,
-                endpoint=request.url.path,
-                status=response.status_code
-            ).inc()
+            record_request(
+                request.method,
+                request.url.path,
+                response.status_code,
+                time.time() - start_time
+            )
 
             return response
 
         except Exception as e:
             # Record failed request
-            duration = time.time() - start_time
-
-            http_request_duration_seconds.labels(
-                method=request.method,
-                endpoint=request.url.path
-            ).observe(duration)
-
-            http_requests_total.labels(
-                method=request.method,
-                endpoint=request.url.path,
-                status=500
-            ).inc()
+            record_request(
+                request.method,
+                request.url.path,
+                500,
+                time.time() - start_time
+            )
 
             raise
 
@@ -128,37 +368,80 @@ class PrometheusMiddleware(BaseHTTPMiddleware):
             active_requests.dec()
 
 
+def _snapshot_system() -> dict:
+    """
+    Read all system-level psutil values in one sweep
+
+    Returns:
+        Dictionary with CPU, memory and disk usage percentages, plus this
+        worker's share of system memory
+    """
+    memory = _cached("vmem", psutil.virtual_memory)
+    return {
+        "cpu_percent": _cached("cpu", psutil.cpu_percent, interval=1),
+        "memory_percent": memory.percent,
+        "disk_percent": _cached("disk", psutil.disk_usage, '/').percent,
+        "worker_memory_percent": _get_process().memory_info().rss / memory.total * 100
+    }
+
+
+# Minimum seconds between two system metric collections
+PSUTIL_MIN_INTERVAL = 2.0
+_last_collect = None
+
+
 def collect_system_metrics():
     """
     Collect system-level metrics
+
+    Calls within PSUTIL_MIN_INTERVAL of the previous collection are skipped.
     """
-    try:
-        # CPU usage
-        cpu_percent = psutil.cpu_percent(interval=1)
-        system_cpu_usage.set(cpu_percent)
+    global _last_collect
+
+    now = time.monotonic()
+    if _last_collect is not None and now - _last_collect < PSUTIL_MIN_INTERVAL:
+        return
+    _last_collect = now
 
-        # Memory usage
-        memory = psutil.virtual_memory()
-        system_memory_usage.set(memory.percent)
+    try:
+        snapshot = _snapshot_system()
+        system_cpu_usage.set(snapshot["cpu_percent"])
+        system_memory_usage.set(snapshot["memory_percent"])
+        system_disk_usage.set(snapshot["disk_percent"])
+        worker_memory_usage.set(snapshot["worker_memory_percent"])
 
     except Exception as e:
         logger.error(f"Error collecting system metrics: {e}")
 
 
+# Serialized metrics are reused for scrapes arriving within this window
+METRICS_CACHE_TTL = 0.5
+_metrics_cache_bytes = None
+_metrics_cache_at = 0.0
+
+
 def get_metrics() -> Response:
     """
     Get Prometheus metrics
 
+    Scrapes arriving within METRICS_CACHE_TTL of the previous one get the
+    same serialized output.
+
     Returns:
         Response with metrics in Prometheus format
     """
-    # Collect system metrics
-    collect_system_metrics()
+    global _metrics_cache_bytes, _metrics_cache_at
+
+    now = time.monotonic()
+    if _metrics_cache_bytes is None or now - _metrics_cache_at >= METRICS_CACHE_TTL:
+        # Collect system metrics
+        collect_system_metrics()
 
-    # Generate metrics
-    metrics = generate_latest()
+        # Generate metrics
+        _metrics_cache_bytes = generate_latest(APP_REGISTRY)
+        _metrics_cache_at = now
 
-    return Response(content=metrics, media_type=CONTENT_TYPE_LATEST)
+    return Response(content=_metrics_cache_bytes, media_type=CONTENT_TYPE_LATEST)
 
 
 # Health check utilities
@@ -180,15 +463,17 @@ class HealthCheck:
         """
         try:
             # Try a simple query
-            db.execute("SELECT 1")
+            db.execute(_PING_STMT)
             return {
-                "status": "healthy",
+                "status": HEALTHY,
+                "code": HealthCode.OK,
                 "message": "Database connection OK"
             }
         except Exception as e:
             logger.error(f"Database health check failed: {e}")
             return {
-                "status": "unhealthy",
+                "status": UNHEALTHY,
+                "code": HealthCode.UNHEALTHY,
                 "message": f"Database error: {str(e)}"
             }
 
@@ -203,24 +488,43 @@ class HealthCheck:
         Returns:
             Health check result
         """
-        if not cache.is_available():
+        if cache.client is None:
             return {
-                "status": "unhealthy",
+                "status": UNHEALTHY,
+                "code": HealthCode.UNHEALTHY,
                 "message": "Redis unavailable"
             }
 
         try:
-            cache.client.ping()
-            stats = cache.get_stats()
+            # PING and both INFO sections share a single round trip
+            _, stats_info, memory_info = (
+                cache.client.pipeline(transaction=False)
+                .ping()
+                .info('stats')
+                .info('memory')
+                .execute()
+            )
+            stats = format_cache_stats(stats_info)
+            stats["used_memory_rss"] = memory_info.get('used_memory_rss', 0)
+            stats["maxmemory"] = memory_info.get('maxmemory', 0)
             return {
-                "status": "healthy",
+                "status": HEALTHY,
+                "code": HealthCode.OK,
                 "message": "Redis connection OK",
                 "stats": stats
             }
+        except redis.ConnectionError:
+            # Configured but unreachable, same as having no client
+            return {
+                "status": UNHEALTHY,
+                "code": HealthCode.UNHEALTHY,
+                "message": "Redis unavailable"
+            }
         except Exception as e:
             logger.error(f"Redis health check failed: {e}")
             return {
-                "status": "unhealthy",
+                "status": UNHEALTHY,
+                "code": HealthCode.UNHEALTHY,
                 "message": f"Redis error: {str(e)}"
             }
 
@@ -233,31 +537,13 @@ class HealthCheck:
             Health check result
         """
         try:
-            disk = psutil.disk_usage('/')
-            percent_used = disk.percent
-
-            if percent_used > 90:
-                return {
-                    "status": "unhealthy",
-                    "message": f"Disk space critically low: {percent_used}% used",
-                    "percent_used": percent_used
-                }
-            elif percent_used > 80:
-                return {
-                    "status": "degraded",
-                    "message": f"Disk space running low: {percent_used}% used",
-                    "percent_used": percent_used
-                }
-            else:
-                return {
-                    "status": "healthy",
-                    "message": f"Disk space OK: {percent_used}% used",
-                    "percent_used": percent_used
-                }
+            disk = _cached("disk", psutil.disk_usage, '/')
+            return _usage_result(disk.percent, DISK_MESSAGES)
         except Exception as e:
             logger.error(f"Disk space check failed: {e}")
             return {
-                "status": "unknown",
+                "status": UNKNOWN,
+                "code": HealthCode.UNKNOWN,
                 "message": f"Could not check disk space: {str(e)}"
             }
 
@@ -270,82 +556,94 @@ class HealthCheck:
             Health check result
         """
         try:
-            memory = psutil.virtual_memory()
-            percent_used = memory.percent
-
-            if percent_used > 90:
-                return {
-                    "status": "unhealthy",
-                    "message": f"Memory critically high: {percent_used}% used",
-                    "percent_used": percent_used
-                }
-            elif percent_used > 80:
-                return {
-                    "status": "degraded",
-                    "message": f"Memory running high: {percent_used}% used",
-                    "percent_used": percent_used
-                }
-            else:
-                return {
-                    "status": "healthy",
-                    "message": f"Memory OK: {percent_used}% used",
-                    "percent_used": percent_used
-                }
+            memory = _cached("vmem", psutil.virtual_memory)
+            return _usage_result(memory.percent, MEMORY_MESSAGES)
         except Exception as e:
             logger.error(f"Memory check failed: {e}")
             return {
-                "status": "unknown",
+                "status": UNKNOWN,
+                "code": HealthCode.UNKNOWN,
                 "message": f"Could not check memory: {str(e)}"
             }
 
     @staticmethod
-    def get_comprehensive_health() -> dict:
+    def get_comprehensive_health(fail_fast: bool = False) -> dict:
         """
         Get comprehensive health status
 
+        Args:
+            fail_fast: Skip the remaining checks once one reports unhealthy
+
         Returns:
             Complete health check results
         """
-        from .cache import get_cache
-        from .database import SessionLocal
-
-        db = SessionLocal()
+        db = _health_session()
         cache = get_cache()
 
         try:
-            health = {
-                "status": "healthy",
+            probes = (
+                ("database", lambda: HealthCheck.check_database(db)),
+                ("redis", lambda: HealthCheck.check_redis(cache)),
+                ("disk", HealthCheck.check_disk_space),
+                ("memory", HealthCheck.check_memory)
+            )
+
+            checks: Dict[str, Dict[str, Any]] = {}
+            if fail_fast:
+                # Run checks in order so later probes can be skipped
+                unhealthy = False
+                for name, probe in probes:
+                    if unhealthy:
+                        checks[name] = {
+                            "status": UNKNOWN,
+                            "code": HealthCode.UNKNOWN,
+                            "message": "Skipped after an unhealthy check"
+                        }
+                        continue
+                    checks[name] = probe()
+                    unhealthy = checks[name]["status"] == UNHEALTHY
+            else:
+                futures = [
+                    (name, _health_check_executor.submit(probe))
+                    for name, probe in probes
+                ]
+                checks = {name: future.result() for name, future in futures}
+
+            # Reduce to the overall status in a single pass
+            overall: str = HEALTHY
+            for result in checks.values():
+                if HEALTH_STATUS_RANK.get(result["status"], 0) > HEALTH_STATUS_RANK[overall]:
+                    overall = result["status"]
+
+            return {
+                "status": overall,
                 "timestamp": time.time(),
-                "version": os.getenv("APP_VERSION", "1.0.0"),
-                "environment": os.getenv("ENVIRONMENT", "development"),
-                "checks": {
-                    "database": HealthCheck.check_database(db),
-                    "redis": HealthCheck.check_redis(cache),
-                    "disk": HealthCheck.check_disk_space(),
-                    "memory": HealthCheck.check_memory()
-                }
+                "version": APP_META.version,
+                "environment": APP_META.environment,
+                "checks": checks
             }
 
-            # Determine overall status
-            statuses = [check["status"] for check in health["checks"].values()]
-            if "unhealthy" in statuses:
-                health["status"] = "unhealthy"
-            elif "degraded" in statuses:
-                health["status"] = "degraded"
-
-            return health
-
         finally:
-            db.close()
+            _health_session.remove()
 
 
 # Application info metric
+_last_app_info = None
+
+
 def set_app_info(version: str = "1.0.0", environment: str = "development"):
     """
     Set application info metric
 
+    Skipped when the values match the ones already applied.
+
     Args:
         version: Application version
         environment: Environment name
     """
+    global _last_app_info
+    if _last_app_info == (version, environment):
+        return
+
     application_info.labels(version=version, environment=environment).set(1)
+    _last_app_info = (version, environment)
@@ -113,7 +113,7 @@ class CategoryStatsResponse(BaseModel):
 
 
 class CompareRequest(BaseModel):
-    asins: List[str] = Field(..., min_items=2, max_items=10)
+    asins: List[str] = Field(..., min_length=2, max_length=10)
 
 
 class CompareResponse(BaseModel):
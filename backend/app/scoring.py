@@ -8,7 +8,7 @@ Implements:
 """
 import math
 from decimal import Decimal
-from typing import Optional
+from typing import Any, Iterable, Optional, Sequence, Tuple
 from datetime import datetime, timedelta
 
 from .logging_config import get_logger
@@ -16,6 +16,48 @@ from .logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Rating thresholds and the hidden gem points they earn, highest first
+RATING_TIERS = (
+    (4.5, 30),
+    (4.0, 20),
+    (3.5, 10),
+)
+
+
+def _to_float(value: Optional[Decimal]) -> float:
+    """
+    Convert an optional Decimal input to float once, with None as 0.0
+    """
+    return float(value) if value is not None else 0.0
+
+
+def _price_ratio(
+    unit_price: Optional[Decimal],
+    category_median_unit_price: Optional[Decimal]
+) -> Optional[float]:
+    """
+    Unit price / category median, divided in Decimal before converting to
+    float so exact tier boundaries (e.g. 0.56 / 0.80) stay on the boundary
+    """
+    if unit_price and category_median_unit_price and category_median_unit_price > 0:
+        return float(unit_price / category_median_unit_price)
+    return None
+
+
+def _price_discount(
+    unit_price: Optional[Decimal],
+    category_median_unit_price: Optional[Decimal]
+) -> float:
+    """
+    Percentage below the category median, computed in Decimal; 0.0 when
+    either price is missing
+    """
+    if unit_price and category_median_unit_price and category_median_unit_price > 0:
+        return float(
+            (category_median_unit_price - unit_price) / category_median_unit_price * 100
+        )
+    return 0.0
+
 
 class ProductScorer:
     """
@@ -56,15 +98,35 @@ class ProductScorer:
         Returns:
             Score from 0-100
         """
+        return ProductScorer._hidden_gem_impl(
+            _to_float(rating),
+            review_count,
+            search_position,
+            _price_discount(unit_price, category_median_unit_price),
+            is_sponsored,
+            sponsored_frequency
+        )
+
+    @staticmethod
+    def _hidden_gem_impl(
+        rating: float,
+        review_count: int,
+        search_position: int,
+        price_discount: float,
+        is_sponsored: bool,
+        sponsored_frequency: float
+    ) -> int:
+        """
+        Hidden Gem Score on plain floats (missing values passed as 0.0)
+        """
         score = 0
 
         # Rating bonus (max 30 points)
-        if rating and rating >= Decimal('4.5'):
-            score += 30
-        elif rating and rating >= Decimal('4.0'):
-            score += 20
-        elif rating and rating >= Decimal('3.5'):
-            score += 10
+        if rating:
+            for threshold, points in RATING_TIERS:
+                if rating >= threshold:
+                    score += points
+                    break
 
         # Review count bonus (max 20 points, log scale)
         if review_count > 0:
@@ -78,21 +140,13 @@ class ProductScorer:
             score += position_bonus
 
         # Unit price bonus vs category median (max 30 points)
-        if unit_price and category_median_unit_price and category_median_unit_price > 0:
-            try:
-                # Calculate discount percentage
-                discount = float((category_median_unit_price - unit_price) / category_median_unit_price * 100)
-                if discount > 0:  # Cheaper than median
-                    price_bonus = min(30, discount)
-                    score += price_bonus
-            except (ValueError, ZeroDivisionError):
-                pass
-
-        # Low ad spend bonus (max 20 points)
-        if not is_sponsored and sponsored_frequency < 0.1:
-            score += 20
-        elif not is_sponsored:
-            score += 10
+        if price_discount > 0:  # Cheaper than median
+            price_bonus = min(30, price_discount)
+            score += price_bonus
+
+        # Low ad spend bonus (max 20 points): 10 for not being sponsored,
+        # another 10 if rarely sponsored (<10%)
+        score += (not is_sponsored) * (10 + 10 * (sponsored_frequency < 0.1))
 
         # Cap at 100
         score = min(100, int(score))
@@ -101,7 +155,7 @@ class ProductScorer:
             f"Hidden gem score calculated: {score}",
             extra={
                 'extra_data': {
-                    'rating': float(rating) if rating else None,
+                    'rating': rating or None,
                     'review_count': review_count,
                     'position': search_position,
                     'score': score
@@ -140,33 +194,49 @@ class ProductScorer:
         Returns:
             Score from 0-100
         """
+        return ProductScorer._deal_quality_impl(
+            _price_ratio(unit_price, category_median_unit_price),
+            _to_float(discount_pct),
+            _to_float(rating),
+            review_count,
+            is_prime
+        )
+
+    @staticmethod
+    def _deal_quality_impl(
+        price_ratio: Optional[float],
+        discount_pct: float,
+        rating: float,
+        review_count: int,
+        is_prime: bool
+    ) -> int:
+        """
+        Deal Quality Score on plain floats (missing values passed as 0.0,
+        a missing price ratio as None)
+        """
         score = 0.0
 
         # Unit price component (40% weight)
-        if unit_price and category_median_unit_price and category_median_unit_price > 0:
-            try:
-                price_ratio = float(unit_price / category_median_unit_price)
-                if price_ratio <= 0.7:  # 30%+ cheaper
-                    score += 40
-                elif price_ratio <= 0.8:  # 20%+ cheaper
-                    score += 35
-                elif price_ratio <= 0.9:  # 10%+ cheaper
-                    score += 30
-                elif price_ratio <= 1.0:  # At or below median
-                    score += 25
-                else:  # Above median
-                    score += max(0, 25 - (price_ratio - 1.0) * 50)
-            except (ValueError, ZeroDivisionError):
-                pass
+        if price_ratio is not None:
+            if price_ratio <= 0.7:  # 30%+ cheaper
+                score += 40
+            elif price_ratio <= 0.8:  # 20%+ cheaper
+                score += 35
+            elif price_ratio <= 0.9:  # 10%+ cheaper
+                score += 30
+            elif price_ratio <= 1.0:  # At or below median
+                score += 25
+            else:  # Above median
+                score += max(0, 25 - (price_ratio - 1.0) * 50)
 
         # Discount component (30% weight)
         if discount_pct:
-            discount_score = min(30, float(discount_pct) * 0.6)
+            discount_score = min(30, discount_pct * 0.6)
             score += discount_score
 
         # Rating component (20% weight)
         if rating:
-            rating_normalized = float(rating) / 5.0  # Normalize to 0-1
+            rating_normalized = rating / 5.0  # Normalize to 0-1
             score += rating_normalized * 20
 
         # Review count component (10% weight)
@@ -175,8 +245,7 @@ class ProductScorer:
             score += review_score
 
         # Prime bonus (+5 points)
-        if is_prime:
-            score += 5
+        score += 5 * bool(is_prime)
 
         score = min(100, int(score))
 
@@ -185,8 +254,11 @@ class ProductScorer:
     @staticmethod
     def calculate_price_performance_score(
         current_price: Decimal,
-        price_history: list,
-        days: int = 90
+        price_history: Optional[list] = None,
+        days: int = 90,
+        *,
+        prices: Optional[Sequence] = None,
+        dates: Optional[Sequence] = None
     ) -> int:
         """
         Calculate how good the current price is based on history (0-100)
@@ -195,53 +267,81 @@ class ProductScorer:
             current_price: Current product price
             price_history: List of (price, date) tuples
             days: Number of days to consider
+            prices: Historical prices, parallel to dates; replaces price_history
+            dates: Dates of the historical prices, parallel to prices
 
         Returns:
             Score from 0-100 (100 = best price ever)
+
+        Raises:
+            ValueError: If only one of prices/dates is given, or they are
+                combined with price_history
         """
-        if not price_history:
-            return 50  # Neutral score if no history
+        if (prices is None) != (dates is None):
+            raise ValueError("prices and dates must be passed together")
+        if prices is not None and price_history is not None:
+            raise ValueError("Pass either price_history or prices/dates, not both")
+
+        history: Iterable[Tuple[Any, Any]]
+        if prices is not None and dates is not None:
+            if not prices:
+                return 50  # Neutral score if no history
+            # Walk the parallel sequences directly, without building pairs
+            history = zip(prices, dates)
+        else:
+            if not price_history:
+                return 50  # Neutral score if no history
+            history = price_history
 
         try:
             # Filter to last N days
             cutoff_date = datetime.now() - timedelta(days=days)
             recent_prices = [
-                float(price) for price, date in price_history
+                float(price) for price, date in history
                 if date >= cutoff_date
             ]
 
             if not recent_prices:
                 return 50
 
-            current = float(current_price)
-            min_price = min(recent_prices)
-            max_price = max(recent_prices)
-            avg_price = sum(recent_prices) / len(recent_prices)
+            return ProductScorer._price_performance_impl(
+                recent_prices,
+                float(current_price)
+            )
 
-            # Calculate position in range
-            if max_price == min_price:
-                return 100  # Only one price point
+        except (ValueError, ZeroDivisionError, TypeError):
+            logger.error("Error calculating price performance score", exc_info=True)
+            return 50
 
-            # Score based on how close to minimum
-            position = (current - min_price) / (max_price - min_price)
+    @staticmethod
+    def _price_performance_impl(recent_prices: list, current: float) -> int:
+        """
+        Price Performance Score on a non-empty list of float prices
+        """
+        min_price = min(recent_prices)
+        max_price = max(recent_prices)
+        avg_price = sum(recent_prices) / len(recent_prices)
 
-            # Invert so lower price = higher score
-            score = int((1 - position) * 100)
+        # Calculate position in range
+        if max_price == min_price:
+            return 100  # Only one price point
 
-            # Bonus if at or near all-time low
-            if current <= min_price * 1.02:  # Within 2% of minimum
-                score = min(100, score + 10)
+        # Score based on how close to minimum
+        position = (current - min_price) / (max_price - min_price)
 
-            # Penalty if above average
-            if current > avg_price:
-                penalty = min(20, ((current - avg_price) / avg_price) * 50)
-                score -= int(penalty)
+        # Invert so lower price = higher score
+        score = int((1 - position) * 100)
 
-            return max(0, min(100, score))
+        # Bonus if at or near all-time low
+        if current <= min_price * 1.02:  # Within 2% of minimum
+            score = min(100, score + 10)
 
-        except (ValueError, ZeroDivisionError, TypeError):
-            logger.error("Error calculating price performance score", exc_info=True)
-            return 50
+        # Penalty if above average
+        if current > avg_price:
+            penalty = min(20, ((current - avg_price) / avg_price) * 50)
+            score -= int(penalty)
+
+        return max(0, min(100, score))
 
     @staticmethod
     def is_true_discount(
@@ -18,9 +18,28 @@ import time
 from typing import List, Dict, Optional
 from bs4 import BeautifulSoup
 import requests
+import soupsieve
 from decimal import Decimal
 from .unit_calculator import extract_and_calculate_unit_price
 
+# Parsing patterns compiled once at import
+_PRICE_RE = re.compile(r'(?:\d[\d,]*)?\.?\d+')
+_RATING_RE = re.compile(r'(\d+(?:\.\d+)?)')
+_REVIEW_RE = re.compile(r'[\d,]+')
+
+# Sponsored indicators that can appear inside a result card
+_SPONSORED_INDICATORS = (
+    '[data-component-type="sp-sponsored-result"], .AdHolder, '
+    '.puis-sponsored-label-text, [aria-label*="Sponsored" i]'
+)
+_SPONSORED_SEL = soupsieve.compile(_SPONSORED_INDICATORS)
+
+# Those indicators plus the label badge, whose text still has to be checked,
+# unioned so a single descendant walk covers them all
+_SPONSORED_CANDIDATES_SEL = soupsieve.compile(
+    _SPONSORED_INDICATORS + ', .s-label-popover-default'
+)
+
 
 class AmazonScraper:
     """
@@ -252,19 +271,20 @@ class AmazonScraper:
         Returns:
             True if sponsored, False otherwise
         """
-        # Method 1: Check data attribute
+        # Indicators on the card element itself
         if card.get('data-component-type') == 'sp-sponsored-result':
             return True
-
-        # Method 2: Check for sponsored text
-        sponsored_badge = card.select_one('.s-label-popover-default')
-        if sponsored_badge and 'sponsored' in sponsored_badge.get_text(strip=True).lower():
-            return True
-
-        # Method 3: Check for AdHolder class
         if 'AdHolder' in card.get('class', []):
             return True
 
+        # Indicators nested inside the card, in one pass; a label badge only
+        # counts when its text says sponsored, in any casing
+        for elem in card.select(_SPONSORED_CANDIDATES_SEL):
+            if _SPONSORED_SEL.match(elem):
+                return True
+            if 'sponsored' in elem.get_text(strip=True).lower():
+                return True
+
         return False
 
     @staticmethod
@@ -281,10 +301,12 @@ class AmazonScraper:
         if not price_text:
             return None
 
-        # Remove currency symbols and parse
-        price_clean = re.sub(r'[^0-9.]', '', price_text)
+        # Take the first number, dropping currency symbols and separators
+        match = _PRICE_RE.search(price_text)
+        if not match:
+            return None
         try:
-            return float(price_clean)
+            return float(match.group().replace(',', ''))
         except ValueError:
             return None
 
@@ -302,7 +324,7 @@ class AmazonScraper:
         if not rating_text:
             return None
 
-        match = re.search(r'(\d+\.?\d*)', rating_text)
+        match = _RATING_RE.search(rating_text)
         if match:
             try:
                 return float(match.group(1))
@@ -325,9 +347,9 @@ class AmazonScraper:
             return None
 
         # Look for numbers with commas (e.g., "12,403")
-        match = re.search(r'([\d,]+)', text)
+        match = _REVIEW_RE.search(text)
         if match:
-            count_str = match.group(1).replace(',', '')
+            count_str = match.group().replace(',', '')
             try:
                 return int(count_str)
             except ValueError:
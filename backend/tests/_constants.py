@@ -0,0 +1,14 @@
+"""
+Decimal values shared across test modules, parsed once at import
+"""
+from decimal import Decimal
+
+
+PRICE_49_99 = Decimal("49.99")
+PRICE_54_99 = Decimal("54.99")
+
+UNIT_0_50 = Decimal("0.50")
+UNIT_0_60 = Decimal("0.60")
+UNIT_0_69 = Decimal("0.69")
+UNIT_0_80 = Decimal("0.80")
+UNIT_1_00 = Decimal("1.00")
@@ -1,48 +1,161 @@
 """
 Pytest configuration and fixtures for SmartAmazon tests
 """
+import functools
 import pytest
+from typing import List
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.pool import StaticPool
 
 from app.main import app
 from app.database import Base, get_db
-from app.models import Product, CategoryStats
+from app.models import Product, PriceHistory, CategoryStats
+from app.schemas import ProductResponse
+from app.scraper import AmazonScraper, MockAmazonScraper
+from datetime import datetime, timedelta
 from decimal import Decimal
 
 
+# Validates lists of ProductResponse in one pydantic-core call
+_RESULTS_ADAPTER = TypeAdapter(List[ProductResponse])
+
 # Test database URL (SQLite in-memory for fast tests)
 SQLALCHEMY_TEST_DATABASE_URL = "sqlite:///:memory:"
 
-# Create test database engine
-engine = create_engine(
-    SQLALCHEMY_TEST_DATABASE_URL,
-    connect_args={"check_same_thread": False},
-    poolclass=StaticPool,
-)
 
-# Create test session
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Drop durability guarantees the throwaway test database does not need
+    """
+    # Let SQLAlchemy emit BEGIN itself so SAVEPOINTs nest correctly
+    dbapi_connection.isolation_level = None
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=MEMORY")
+    cursor.execute("PRAGMA synchronous=OFF")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
 
 
-@pytest.fixture(scope="function")
-def db_session():
+def _begin_sqlite_transaction(connection):
+    """
+    Emit an explicit BEGIN that pysqlite would otherwise defer
+    """
+    connection.exec_driver_sql("BEGIN")
+
+
+def _worker_id(config):
+    """
+    Return the pytest-xdist worker id, or "main" when tests run in one process
+    """
+    return getattr(config, "workerinput", {}).get("workerid", "main")
+
+
+def _create_test_engine(url=SQLALCHEMY_TEST_DATABASE_URL):
+    """
+    Create an in-memory SQLite engine configured for tests
+    """
+    test_engine = create_engine(
+        url,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+        insertmanyvalues_page_size=1000,
+    )
+    event.listen(test_engine, "connect", _set_sqlite_pragmas)
+    event.listen(test_engine, "begin", _begin_sqlite_transaction)
+    return test_engine
+
+
+# Create test session (bound to a connection per test)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False)
+
+
+@pytest.fixture(scope="session")
+def db_engine(request):
     """
-    Create a fresh database session for each test
+    Create the engine and schema once per test process
+
+    Each pytest-xdist worker gets its own named in-memory database, so
+    tests can run with ``pytest -n auto`` without sharing state.
     """
-    # Create tables
+    engine = _create_test_engine(
+        f"sqlite:///file:test_{_worker_id(request.config)}?mode=memory&uri=true"
+    )
     Base.metadata.create_all(bind=engine)
 
-    session = TestingSessionLocal()
+    try:
+        yield engine
+    finally:
+        Base.metadata.drop_all(bind=engine)
+        engine.dispose()
+
+
+@pytest.fixture(scope="function")
+def db_session(db_engine):
+    """
+    Create a database session for each test, isolated by a rolled back transaction
+
+    Commits inside the test only release a SAVEPOINT, so nothing outlives
+    the test.
+    """
+    connection = db_engine.connect()
+    transaction = connection.begin()
+    session = TestingSessionLocal(
+        bind=connection,
+        join_transaction_mode="create_savepoint"
+    )
 
     try:
         yield session
     finally:
         session.close()
-        # Drop tables after test
-        Base.metadata.drop_all(bind=engine)
+        transaction.rollback()
+        connection.close()
+
+
+@pytest.fixture(scope="module")
+def seeded_product():
+    """
+    Seed one product with a short price history for read-only tests
+
+    The rows are inserted once per module inside a transaction that is
+    rolled back on teardown. Prices are 60.00, 40.00 and 50.00 recorded
+    10, 5 and 1 days ago respectively.
+
+    Returns:
+        Tuple of (product_id, session)
+    """
+    # A dedicated engine, since the shared one is rolled back after every test
+    module_engine = _create_test_engine()
+    Base.metadata.create_all(bind=module_engine)
+    connection = module_engine.connect()
+    transaction = connection.begin()
+
+    now = datetime.now()
+    product_id = connection.execute(
+        insert(Product).values(asin="TEST123", title="Test Product")
+    ).inserted_primary_key[0]
+    connection.execute(insert(PriceHistory), [
+        {"product_id": product_id, "asin": "TEST123", "price": price,
+         "recorded_at": now - timedelta(days=days_ago)}
+        for price, days_ago in (
+            (Decimal("60.00"), 10),
+            (Decimal("40.00"), 5),
+            (Decimal("50.00"), 1),
+        )
+    ])
+
+    session = Session(bind=connection)
+
+    try:
+        yield product_id, session
+    finally:
+        session.close()
+        transaction.rollback()
+        connection.close()
+        module_engine.dispose()
 
 
 @pytest.fixture(scope="function")
@@ -141,6 +254,66 @@ def sample_products(db_session):
     return products
 
 
+@pytest.fixture(scope="session")
+def now():
+    """
+    Single timestamp shared by fixtures for the whole test run
+    """
+    return datetime.now()
+
+
+@pytest.fixture(scope="session")
+def sample_product_responses(now):
+    """
+    Ten ProductResponse objects, validated once for the whole test run
+    """
+    return _RESULTS_ADAPTER.validate_python([
+        {
+            "asin": f"TEST{i}",
+            "title": f"Product {i}",
+            "last_scraped_at": now,
+            "created_at": now,
+            "updated_at": now
+        }
+        for i in range(10)
+    ])
+
+
+@pytest.fixture(scope="session")
+def scraper():
+    """
+    Shared AmazonScraper for tests that do not mutate it
+
+    Session scoped, so each xdist worker builds a single instance.
+    """
+    return AmazonScraper(use_proxies=False)
+
+
+@pytest.fixture(scope="session")
+def mock_scraper():
+    """
+    Shared MockAmazonScraper for tests that do not mutate it
+
+    Session scoped, so each xdist worker builds a single instance.
+    """
+    return MockAmazonScraper()
+
+
+@pytest.fixture(scope="module")
+def mock_search(mock_scraper):
+    """
+    Memoized mock search keyed on (query, pages)
+
+    Results are returned as a tuple of the generated dicts; tests that
+    mutate products should deep-copy them first.
+    """
+    @functools.lru_cache(maxsize=32)
+    def _go(query: str, pages: int = 1):
+        return tuple(mock_scraper.search(query=query, pages=pages))
+
+    return _go
+
+
 @pytest.fixture
 def auth_headers():
     """
@@ -7,33 +7,180 @@ This module tests:
 3. System metrics collection
 4. Metrics endpoint
 """
+import threading
+from types import SimpleNamespace
+
 import pytest
-from unittest.mock import Mock, patch, MagicMock
-from prometheus_client import REGISTRY
+import redis
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.pool import QueuePool
+from unittest.mock import Mock, patch, MagicMock, DEFAULT
 
 from app.monitoring import (
+    APP_REGISTRY,
     collect_system_metrics,
     get_metrics,
+    APP_META,
     HealthCheck,
-    set_app_info
+    HealthCode,
+    _PING_STMT,
+    refresh_app_meta,
+    HEALTHY,
+    HEALTH_STATUSES,
+    set_app_info,
+    _psutil_cache
 )
 
 
+class FakeDB:
+    """Minimal stand-in for a SQLAlchemy session"""
+
+    __slots__ = ("raises", "executed", "closed")
+
+    def __init__(self, raises=None):
+        self.raises = raises
+        self.executed = []
+        self.closed = False
+
+    def execute(self, statement):
+        self.executed.append(statement)
+        if self.raises is not None:
+            raise self.raises
+
+    def close(self):
+        self.closed = True
+
+
+class FakePipeline:
+    """Minimal stand-in for a non-transactional redis pipeline"""
+
+    __slots__ = ("client", "commands", "transaction", "executed")
+
+    def __init__(self, client, transaction=True):
+        self.client = client
+        self.commands = []
+        self.transaction = transaction
+        self.executed = 0
+
+    def ping(self):
+        self.commands.append(("ping",))
+        return self
+
+    def info(self, section):
+        self.commands.append(("info", section))
+        return self
+
+    def execute(self):
+        self.executed += 1
+        if self.client.raises is not None:
+            raise self.client.raises
+        replies = {"stats": self.client.stats, "memory": self.client.memory}
+        return [True if command[0] == "ping" else replies[command[1]] for command in self.commands]
+
+
+class FakeRedisClient:
+    """Minimal stand-in for a redis client"""
+
+    __slots__ = ("raises", "stats", "memory", "pipelines")
+
+    def __init__(self, raises=None, stats=None, memory=None):
+        self.raises = raises
+        self.stats = stats or {}
+        self.memory = memory or {}
+        self.pipelines = []
+
+    def pipeline(self, transaction=True):
+        pipeline = FakePipeline(self, transaction=transaction)
+        self.pipelines.append(pipeline)
+        return pipeline
+
+
+class FakeCache:
+    """Minimal stand-in for CacheService"""
+
+    __slots__ = ("client",)
+
+    def __init__(self, available=True, stats=None, memory=None, ping_raises=None):
+        self.client = FakeRedisClient(raises=ping_raises, stats=stats, memory=memory) if available else None
+
+
+@pytest.fixture(autouse=True)
+def clear_monitoring_caches(monkeypatch):
+    """Start every test with no cached psutil readings or metrics output"""
+    _psutil_cache.clear()
+    monkeypatch.setattr('app.monitoring._metrics_cache_bytes', None)
+    monkeypatch.setattr('app.monitoring._last_collect', None)
+    yield
+    _psutil_cache.clear()
+
+
 class TestSystemMetricsCollection:
     """Tests for collect_system_metrics function"""
 
+    @patch('app.monitoring.psutil.disk_usage')
     @patch('app.monitoring.psutil.cpu_percent')
     @patch('app.monitoring.psutil.virtual_memory')
-    def test_collect_system_metrics_success(self, mock_memory, mock_cpu):
+    def test_collect_system_metrics_success(self, mock_memory, mock_cpu, mock_disk):
         """Test successful system metrics collection"""
         mock_cpu.return_value = 45.5
-        mock_memory.return_value = Mock(percent=62.3)
+        mock_memory.return_value = Mock(percent=62.3, total=16 * 1024 ** 3)
+        mock_disk.return_value = Mock(percent=40.0)
 
         collect_system_metrics()
 
         # Verify metrics were called
         assert mock_cpu.called
         assert mock_memory.called
+        assert mock_disk.called
+
+    @patch('app.monitoring.worker_memory_usage')
+    @patch('app.monitoring.system_disk_usage')
+    @patch('app.monitoring.system_memory_usage')
+    @patch('app.monitoring.system_cpu_usage')
+    @patch('app.monitoring._snapshot_system')
+    def test_collect_system_metrics_uses_snapshot(
+        self,
+        mock_snapshot,
+        mock_cpu_gauge,
+        mock_memory_gauge,
+        mock_disk_gauge,
+        mock_worker_gauge
+    ):
+        """Test that all gauges are set from a single system snapshot"""
+        mock_snapshot.return_value = {
+            "cpu_percent": 45.5,
+            "memory_percent": 62.3,
+            "disk_percent": 40.0,
+            "worker_memory_percent": 1.5
+        }
+
+        collect_system_metrics()
+
+        assert mock_snapshot.call_count == 1
+        mock_cpu_gauge.set.assert_called_once_with(45.5)
+        mock_memory_gauge.set.assert_called_once_with(62.3)
+        mock_disk_gauge.set.assert_called_once_with(40.0)
+        mock_worker_gauge.set.assert_called_once_with(1.5)
+
+    @patch('app.monitoring.time.monotonic')
+    @patch('app.monitoring._snapshot_system')
+    def test_collect_system_metrics_throttled(self, mock_snapshot, mock_monotonic):
+        """Test that collections within PSUTIL_MIN_INTERVAL are skipped"""
+        mock_monotonic.side_effect = [100.0, 101.0, 102.5]
+
+        collect_system_metrics()
+        collect_system_metrics()
+        assert mock_snapshot.call_count == 1
+
+        collect_system_metrics()
+        assert mock_snapshot.call_count == 2
+
+    def test_uses_cached_process_handle(self):
+        """Test that the psutil process handle is created once per process"""
+        from app.monitoring import _get_process
+
+        assert _get_process() is _get_process()
 
     @patch('app.monitoring.psutil.cpu_percent')
     @patch('app.monitoring.psutil.virtual_memory')
@@ -44,6 +191,20 @@ class TestSystemMetricsCollection:
         # Should not raise exception
         collect_system_metrics()
 
+    @patch('app.monitoring.psutil.disk_usage')
+    @patch('app.monitoring.psutil.cpu_percent')
+    @patch('app.monitoring.psutil.virtual_memory')
+    def test_virtual_memory_cached_across_checks(self, mock_memory, mock_cpu, mock_disk):
+        """Test that a health check and a scrape share one virtual_memory() read"""
+        mock_cpu.return_value = 45.5
+        mock_memory.return_value = Mock(percent=62.3, total=16 * 1024 ** 3)
+        mock_disk.return_value = Mock(percent=40.0)
+
+        HealthCheck.check_memory()
+        collect_system_metrics()
+
+        assert mock_memory.call_count == 1
+
 
 class TestGetMetrics:
     """Tests for get_metrics endpoint"""
@@ -71,39 +232,86 @@ class TestGetMetrics:
         # Should have Prometheus content type
         assert "text/plain" in response.media_type or "text" in response.media_type
 
+    @patch('app.monitoring.collect_system_metrics')
+    @patch('app.monitoring.generate_latest')
+    def test_get_metrics_no_compression(self, mock_generate, mock_collect):
+        """Test that the metrics body is served uncompressed"""
+        mock_generate.return_value = b"metrics"
+
+        response = get_metrics()
+
+        assert response.headers.get("Content-Encoding") != "gzip"
+        assert response.body == b"metrics"
+
+    @patch('app.monitoring.collect_system_metrics')
+    @patch('app.monitoring.generate_latest')
+    def test_get_metrics_body_not_copied(self, mock_generate, mock_collect):
+        """Test that the generated bytes are handed to the response as-is"""
+        payload = b"# HELP metric\n" * 1000
+        mock_generate.return_value = payload
+
+        response = get_metrics()
+
+        assert response.body is payload
+
+    @patch('app.monitoring.collect_system_metrics')
+    @patch('app.monitoring.generate_latest')
+    def test_metrics_cached_within_window(self, mock_generate, mock_collect):
+        """Test that back-to-back scrapes reuse the serialized metrics"""
+        mock_generate.return_value = b"metrics"
+
+        first = get_metrics()
+        second = get_metrics()
+
+        assert mock_generate.call_count == 1
+        assert mock_collect.call_count == 1
+        assert first.body == second.body == b"metrics"
+
+    @patch('app.monitoring.time.monotonic')
+    @patch('app.monitoring.collect_system_metrics')
+    @patch('app.monitoring.generate_latest')
+    def test_metrics_regenerated_after_ttl(self, mock_generate, mock_collect, mock_monotonic):
+        """Test that metrics are regenerated once the cache window has passed"""
+        mock_generate.side_effect = [b"first", b"second"]
+        mock_monotonic.side_effect = [100.0, 100.6]
+
+        assert get_metrics().body == b"first"
+        assert get_metrics().body == b"second"
+        assert mock_generate.call_count == 2
+
 
 class TestHealthCheckDatabase:
     """Tests for database health check"""
 
     def test_check_database_healthy(self):
         """Test database health check when database is healthy"""
-        mock_db = Mock()
-        mock_db.execute.return_value = None
+        db = FakeDB()
 
-        result = HealthCheck.check_database(mock_db)
+        result = HealthCheck.check_database(db)
 
         assert result["status"] == "healthy"
+        assert result["code"] == HealthCode.OK
         assert "OK" in result["message"]
-        assert mock_db.execute.called
+        assert db.executed == [_PING_STMT]
+        assert db.executed[0] is _PING_STMT
 
     def test_check_database_unhealthy(self):
         """Test database health check when database fails"""
-        mock_db = Mock()
-        mock_db.execute.side_effect = Exception("Connection failed")
+        db = FakeDB(raises=Exception("Connection failed"))
 
-        result = HealthCheck.check_database(mock_db)
+        result = HealthCheck.check_database(db)
 
         assert result["status"] == "unhealthy"
         assert "error" in result["message"].lower()
 
     def test_check_database_connection_error(self):
         """Test database health check with connection error"""
-        mock_db = Mock()
-        mock_db.execute.side_effect = ConnectionError("Cannot connect")
+        db = FakeDB(raises=ConnectionError("Cannot connect"))
 
-        result = HealthCheck.check_database(mock_db)
+        result = HealthCheck.check_database(db)
 
         assert result["status"] == "unhealthy"
+        assert result["code"] == HealthCode.UNHEALTHY
         assert "Cannot connect" in result["message"]
 
 
@@ -112,89 +320,102 @@ class TestHealthCheckRedis:
 
     def test_check_redis_healthy(self):
         """Test Redis health check when Redis is healthy"""
-        mock_cache = Mock()
-        mock_cache.is_available.return_value = True
-        mock_cache.client.ping.return_value = True
-        mock_cache.get_stats.return_value = {
-            "hits": 1000,
-            "misses": 100,
-            "hit_rate": 0.91
-        }
+        cache = FakeCache(stats={
+            "keyspace_hits": 1000,
+            "keyspace_misses": 100
+        })
 
-        result = HealthCheck.check_redis(mock_cache)
+        result = HealthCheck.check_redis(cache)
 
         assert result["status"] == "healthy"
+        assert result["code"] == HealthCode.OK
         assert "OK" in result["message"]
         assert "stats" in result
 
     def test_check_redis_unavailable(self):
         """Test Redis health check when Redis is unavailable"""
-        mock_cache = Mock()
-        mock_cache.is_available.return_value = False
+        cache = FakeCache(available=False)
 
-        result = HealthCheck.check_redis(mock_cache)
+        result = HealthCheck.check_redis(cache)
 
         assert result["status"] == "unhealthy"
+        assert result["code"] == HealthCode.UNHEALTHY
         assert "unavailable" in result["message"]
 
     def test_check_redis_ping_fails(self):
         """Test Redis health check when ping fails"""
-        mock_cache = Mock()
-        mock_cache.is_available.return_value = True
-        mock_cache.client.ping.side_effect = Exception("Connection timeout")
+        cache = FakeCache(ping_raises=Exception("Connection timeout"))
 
-        result = HealthCheck.check_redis(mock_cache)
+        result = HealthCheck.check_redis(cache)
 
         assert result["status"] == "unhealthy"
         assert "error" in result["message"].lower()
 
+    def test_check_redis_unreachable(self):
+        """Test that a configured but unreachable Redis reports unavailable"""
+        cache = FakeCache(ping_raises=redis.ConnectionError("Connection refused"))
+
+        result = HealthCheck.check_redis(cache)
+
+        assert result["status"] == "unhealthy"
+        assert result["code"] == HealthCode.UNHEALTHY
+        assert result["message"] == "Redis unavailable"
+
     def test_check_redis_includes_stats(self):
         """Test that Redis health check includes statistics"""
-        mock_cache = Mock()
-        mock_cache.is_available.return_value = True
-        mock_cache.client.ping.return_value = True
-        mock_cache.get_stats.return_value = {"hits": 100, "misses": 10}
+        cache = FakeCache(
+            stats={"keyspace_hits": 100, "keyspace_misses": 10},
+            memory={"used_memory_rss": 2048, "maxmemory": 4096}
+        )
 
-        result = HealthCheck.check_redis(mock_cache)
+        result = HealthCheck.check_redis(cache)
 
         assert "stats" in result
-        assert result["stats"]["hits"] == 100
-
-
-class TestHealthCheckDiskSpace:
-    """Tests for disk space health check"""
+        assert result["stats"]["keyspace_hits"] == 100
+        assert result["stats"]["used_memory_rss"] == 2048
+        assert result["stats"]["maxmemory"] == 4096
 
-    @patch('app.monitoring.psutil.disk_usage')
-    def test_check_disk_space_healthy(self, mock_disk):
-        """Test disk space check when space is adequate"""
-        mock_disk.return_value = Mock(percent=50.0)
+    def test_check_redis_uses_pipeline(self):
+        """Test that the Redis probe makes a single pipelined round trip"""
+        cache = FakeCache()
 
-        result = HealthCheck.check_disk_space()
+        result = HealthCheck.check_redis(cache)
 
+        # FakeRedisClient has no ping/info of its own, so any call outside
+        # the pipeline would surface as a "Redis error" result
         assert result["status"] == "healthy"
-        assert result["percent_used"] == 50.0
-
-    @patch('app.monitoring.psutil.disk_usage')
-    def test_check_disk_space_degraded(self, mock_disk):
-        """Test disk space check when space is running low"""
-        mock_disk.return_value = Mock(percent=85.0)
+        assert len(cache.client.pipelines) == 1
+        pipeline = cache.client.pipelines[0]
+        assert pipeline.transaction is False
+        assert pipeline.commands == [("ping",), ("info", "stats"), ("info", "memory")]
+        assert pipeline.executed == 1
 
-        result = HealthCheck.check_disk_space()
 
-        assert result["status"] == "degraded"
-        assert "running low" in result["message"]
-        assert result["percent_used"] == 85.0
+class TestHealthCheckDiskSpace:
+    """Tests for disk space health check"""
 
+    @pytest.mark.parametrize("percent,status,code,message", [
+        (50.0, "healthy", HealthCode.OK, "OK"),
+        (79.9, "healthy", HealthCode.OK, "OK"),
+        (80.0, "healthy", HealthCode.OK, "OK"),
+        (80.1, "degraded", HealthCode.DEGRADED, "running low"),
+        (85.0, "degraded", HealthCode.DEGRADED, "running low"),
+        (89.9, "degraded", HealthCode.DEGRADED, "running low"),
+        (90.0, "degraded", HealthCode.DEGRADED, "running low"),
+        (90.1, "unhealthy", HealthCode.UNHEALTHY, "critically low"),
+        (95.0, "unhealthy", HealthCode.UNHEALTHY, "critically low"),
+    ])
     @patch('app.monitoring.psutil.disk_usage')
-    def test_check_disk_space_unhealthy(self, mock_disk):
-        """Test disk space check when space is critically low"""
-        mock_disk.return_value = Mock(percent=95.0)
+    def test_check_disk_space(self, mock_disk, percent, status, code, message):
+        """Test disk space status across the 80% and 90% thresholds"""
+        mock_disk.return_value = Mock(percent=percent)
 
         result = HealthCheck.check_disk_space()
 
-        assert result["status"] == "unhealthy"
-        assert "critically low" in result["message"]
-        assert result["percent_used"] == 95.0
+        assert result["status"] == status
+        assert result["code"] == code
+        assert message in result["message"]
+        assert result["percent_used"] == percent
 
     @patch('app.monitoring.psutil.disk_usage')
     def test_check_disk_space_error(self, mock_disk):
@@ -204,59 +425,42 @@ class TestHealthCheckDiskSpace:
         result = HealthCheck.check_disk_space()
 
         assert result["status"] == "unknown"
+        assert result["code"] == HealthCode.UNKNOWN
         assert "Could not check" in result["message"]
 
     @patch('app.monitoring.psutil.disk_usage')
-    def test_check_disk_space_threshold_80(self, mock_disk):
-        """Test that 80% threshold triggers degraded status"""
-        mock_disk.return_value = Mock(percent=80.1)
-
-        result = HealthCheck.check_disk_space()
-
-        assert result["status"] == "degraded"
-
-    @patch('app.monitoring.psutil.disk_usage')
-    def test_check_disk_space_threshold_90(self, mock_disk):
-        """Test that 90% threshold triggers unhealthy status"""
-        mock_disk.return_value = Mock(percent=90.1)
+    def test_status_strings_interned(self, mock_disk):
+        """Test that checks return the shared status constants"""
+        mock_disk.return_value = Mock(percent=50.0)
 
         result = HealthCheck.check_disk_space()
 
-        assert result["status"] == "unhealthy"
+        assert result["status"] is HEALTHY
+        assert result["status"] in HEALTH_STATUSES
 
 
 class TestHealthCheckMemory:
     """Tests for memory health check"""
 
+    @pytest.mark.parametrize("percent,status,code,message", [
+        (60.0, "healthy", HealthCode.OK, "OK"),
+        (80.0, "healthy", HealthCode.OK, "OK"),
+        (80.1, "degraded", HealthCode.DEGRADED, "running high"),
+        (85.0, "degraded", HealthCode.DEGRADED, "running high"),
+        (90.1, "unhealthy", HealthCode.UNHEALTHY, "critically high"),
+        (95.0, "unhealthy", HealthCode.UNHEALTHY, "critically high"),
+    ])
     @patch('app.monitoring.psutil.virtual_memory')
-    def test_check_memory_healthy(self, mock_memory):
-        """Test memory check when usage is normal"""
-        mock_memory.return_value = Mock(percent=60.0)
+    def test_check_memory(self, mock_memory, percent, status, code, message):
+        """Test memory status across the 80% and 90% thresholds"""
+        mock_memory.return_value = Mock(percent=percent)
 
         result = HealthCheck.check_memory()
 
-        assert result["status"] == "healthy"
-        assert result["percent_used"] == 60.0
-
-    @patch('app.monitoring.psutil.virtual_memory')
-    def test_check_memory_degraded(self, mock_memory):
-        """Test memory check when usage is high"""
-        mock_memory.return_value = Mock(percent=85.0)
-
-        result = HealthCheck.check_memory()
-
-        assert result["status"] == "degraded"
-        assert "running high" in result["message"]
-
-    @patch('app.monitoring.psutil.virtual_memory')
-    def test_check_memory_unhealthy(self, mock_memory):
-        """Test memory check when usage is critically high"""
-        mock_memory.return_value = Mock(percent=95.0)
-
-        result = HealthCheck.check_memory()
-
-        assert result["status"] == "unhealthy"
-        assert "critically high" in result["message"]
+        assert result["status"] == status
+        assert result["code"] == code
+        assert message in result["message"]
+        assert result["percent_used"] == percent
 
     @patch('app.monitoring.psutil.virtual_memory')
     def test_check_memory_error(self, mock_memory):
@@ -267,49 +471,40 @@ class TestHealthCheckMemory:
 
         assert result["status"] == "unknown"
 
-    @patch('app.monitoring.psutil.virtual_memory')
-    def test_check_memory_thresholds(self, mock_memory):
-        """Test memory check thresholds"""
-        # 80% threshold
-        mock_memory.return_value = Mock(percent=80.1)
-        result = HealthCheck.check_memory()
-        assert result["status"] == "degraded"
 
-        # 90% threshold
-        mock_memory.return_value = Mock(percent=90.1)
-        result = HealthCheck.check_memory()
-        assert result["status"] == "unhealthy"
+@pytest.fixture
+def patched_monitoring():
+    """Patch every dependency of get_comprehensive_health in one go"""
+    with patch.multiple(
+        'app.monitoring.HealthCheck',
+        check_database=DEFAULT,
+        check_redis=DEFAULT,
+        check_disk_space=DEFAULT,
+        check_memory=DEFAULT
+    ) as checks, patch.multiple(
+        'app.monitoring',
+        _health_session=DEFAULT,
+        get_cache=DEFAULT
+    ) as deps:
+        db = FakeDB()
+        deps["_health_session"].return_value = db
+        yield SimpleNamespace(db=db, **checks, **deps)
 
 
 class TestComprehensiveHealth:
     """Tests for get_comprehensive_health method"""
 
-    @patch('app.monitoring.HealthCheck.check_database')
-    @patch('app.monitoring.HealthCheck.check_redis')
-    @patch('app.monitoring.HealthCheck.check_disk_space')
-    @patch('app.monitoring.HealthCheck.check_memory')
-    @patch('app.monitoring.SessionLocal')
-    @patch('app.monitoring.get_cache')
     @patch.dict('os.environ', {'APP_VERSION': '1.2.3', 'ENVIRONMENT': 'production'})
-    def test_comprehensive_health_all_healthy(
-        self,
-        mock_get_cache,
-        mock_session,
-        mock_memory_check,
-        mock_disk_check,
-        mock_redis_check,
-        mock_db_check
-    ):
+    def test_comprehensive_health_all_healthy(self, patched_monitoring, monkeypatch):
         """Test comprehensive health when all checks pass"""
-        # Mock all checks to return healthy
-        mock_db_check.return_value = {"status": "healthy", "message": "OK"}
-        mock_redis_check.return_value = {"status": "healthy", "message": "OK"}
-        mock_disk_check.return_value = {"status": "healthy", "message": "OK"}
-        mock_memory_check.return_value = {"status": "healthy", "message": "OK"}
+        monkeypatch.setattr('app.monitoring.APP_META', APP_META)
+        refresh_app_meta()
 
-        # Mock database session
-        mock_db = Mock()
-        mock_session.return_value = mock_db
+        # Mock all checks to return healthy
+        patched_monitoring.check_database.return_value = {"status": "healthy", "message": "OK"}
+        patched_monitoring.check_redis.return_value = {"status": "healthy", "message": "OK"}
+        patched_monitoring.check_disk_space.return_value = {"status": "healthy", "message": "OK"}
+        patched_monitoring.check_memory.return_value = {"status": "healthy", "message": "OK"}
 
         result = HealthCheck.get_comprehensive_health()
 
@@ -318,31 +513,27 @@ class TestComprehensiveHealth:
         assert result["environment"] == "production"
         assert "checks" in result
         assert "timestamp" in result
-        assert mock_db.close.called
-
-    @patch('app.monitoring.HealthCheck.check_database')
-    @patch('app.monitoring.HealthCheck.check_redis')
-    @patch('app.monitoring.HealthCheck.check_disk_space')
-    @patch('app.monitoring.HealthCheck.check_memory')
-    @patch('app.monitoring.SessionLocal')
-    @patch('app.monitoring.get_cache')
-    def test_comprehensive_health_one_unhealthy(
-        self,
-        mock_get_cache,
-        mock_session,
-        mock_memory_check,
-        mock_disk_check,
-        mock_redis_check,
-        mock_db_check
-    ):
-        """Test comprehensive health when one check fails"""
-        mock_db_check.return_value = {"status": "unhealthy", "message": "Failed"}
-        mock_redis_check.return_value = {"status": "healthy", "message": "OK"}
-        mock_disk_check.return_value = {"status": "healthy", "message": "OK"}
-        mock_memory_check.return_value = {"status": "healthy", "message": "OK"}
+        patched_monitoring._health_session.remove.assert_called_once_with()
 
-        mock_db = Mock()
-        mock_session.return_value = mock_db
+    @patch.dict('os.environ', {'APP_VERSION': '9.9.9'})
+    def test_app_meta_cached_at_import(self, patched_monitoring):
+        """Test that version is read from the cached metadata, not os.environ"""
+        patched_monitoring.check_database.return_value = {"status": "healthy"}
+        patched_monitoring.check_redis.return_value = {"status": "healthy"}
+        patched_monitoring.check_disk_space.return_value = {"status": "healthy"}
+        patched_monitoring.check_memory.return_value = {"status": "healthy"}
+
+        result = HealthCheck.get_comprehensive_health()
+
+        assert result["version"] == APP_META.version
+        assert result["version"] != "9.9.9"
+
+    def test_comprehensive_health_one_unhealthy(self, patched_monitoring):
+        """Test comprehensive health when one check fails"""
+        patched_monitoring.check_database.return_value = {"status": "unhealthy", "message": "Failed"}
+        patched_monitoring.check_redis.return_value = {"status": "healthy", "message": "OK"}
+        patched_monitoring.check_disk_space.return_value = {"status": "healthy", "message": "OK"}
+        patched_monitoring.check_memory.return_value = {"status": "healthy", "message": "OK"}
 
         result = HealthCheck.get_comprehensive_health()
 
@@ -350,58 +541,24 @@ class TestComprehensiveHealth:
         assert result["status"] == "unhealthy"
         assert result["checks"]["database"]["status"] == "unhealthy"
 
-    @patch('app.monitoring.HealthCheck.check_database')
-    @patch('app.monitoring.HealthCheck.check_redis')
-    @patch('app.monitoring.HealthCheck.check_disk_space')
-    @patch('app.monitoring.HealthCheck.check_memory')
-    @patch('app.monitoring.SessionLocal')
-    @patch('app.monitoring.get_cache')
-    def test_comprehensive_health_degraded(
-        self,
-        mock_get_cache,
-        mock_session,
-        mock_memory_check,
-        mock_disk_check,
-        mock_redis_check,
-        mock_db_check
-    ):
+    def test_comprehensive_health_degraded(self, patched_monitoring):
         """Test comprehensive health with degraded services"""
-        mock_db_check.return_value = {"status": "healthy", "message": "OK"}
-        mock_redis_check.return_value = {"status": "healthy", "message": "OK"}
-        mock_disk_check.return_value = {"status": "degraded", "message": "Low space"}
-        mock_memory_check.return_value = {"status": "healthy", "message": "OK"}
-
-        mock_db = Mock()
-        mock_session.return_value = mock_db
+        patched_monitoring.check_database.return_value = {"status": "healthy", "message": "OK"}
+        patched_monitoring.check_redis.return_value = {"status": "healthy", "message": "OK"}
+        patched_monitoring.check_disk_space.return_value = {"status": "degraded", "message": "Low space"}
+        patched_monitoring.check_memory.return_value = {"status": "healthy", "message": "OK"}
 
         result = HealthCheck.get_comprehensive_health()
 
         # Overall status should be degraded
         assert result["status"] == "degraded"
 
-    @patch('app.monitoring.HealthCheck.check_database')
-    @patch('app.monitoring.HealthCheck.check_redis')
-    @patch('app.monitoring.HealthCheck.check_disk_space')
-    @patch('app.monitoring.HealthCheck.check_memory')
-    @patch('app.monitoring.SessionLocal')
-    @patch('app.monitoring.get_cache')
-    def test_comprehensive_health_includes_all_checks(
-        self,
-        mock_get_cache,
-        mock_session,
-        mock_memory_check,
-        mock_disk_check,
-        mock_redis_check,
-        mock_db_check
-    ):
+    def test_comprehensive_health_includes_all_checks(self, patched_monitoring):
         """Test that comprehensive health includes all check results"""
-        mock_db_check.return_value = {"status": "healthy"}
-        mock_redis_check.return_value = {"status": "healthy"}
-        mock_disk_check.return_value = {"status": "healthy"}
-        mock_memory_check.return_value = {"status": "healthy"}
-
-        mock_db = Mock()
-        mock_session.return_value = mock_db
+        patched_monitoring.check_database.return_value = {"status": "healthy"}
+        patched_monitoring.check_redis.return_value = {"status": "healthy"}
+        patched_monitoring.check_disk_space.return_value = {"status": "healthy"}
+        patched_monitoring.check_memory.return_value = {"status": "healthy"}
 
         result = HealthCheck.get_comprehensive_health()
 
@@ -410,34 +567,78 @@ class TestComprehensiveHealth:
         assert "disk" in result["checks"]
         assert "memory" in result["checks"]
 
-    @patch('app.monitoring.HealthCheck.check_database')
-    @patch('app.monitoring.HealthCheck.check_redis')
-    @patch('app.monitoring.HealthCheck.check_disk_space')
-    @patch('app.monitoring.HealthCheck.check_memory')
-    @patch('app.monitoring.SessionLocal')
-    @patch('app.monitoring.get_cache')
-    def test_comprehensive_health_closes_db(
-        self,
-        mock_get_cache,
-        mock_session,
-        mock_memory_check,
-        mock_disk_check,
-        mock_redis_check,
-        mock_db_check
-    ):
+    def test_comprehensive_health_closes_db(self, patched_monitoring):
         """Test that database session is closed after health check"""
-        mock_db_check.return_value = {"status": "healthy"}
-        mock_redis_check.return_value = {"status": "healthy"}
-        mock_disk_check.return_value = {"status": "healthy"}
-        mock_memory_check.return_value = {"status": "healthy"}
-
-        mock_db = Mock()
-        mock_session.return_value = mock_db
+        patched_monitoring.check_database.return_value = {"status": "healthy"}
+        patched_monitoring.check_redis.return_value = {"status": "healthy"}
+        patched_monitoring.check_disk_space.return_value = {"status": "healthy"}
+        patched_monitoring.check_memory.return_value = {"status": "healthy"}
 
         HealthCheck.get_comprehensive_health()
 
-        # Verify database session was closed
-        assert mock_db.close.called
+        # Verify the scoped session was released
+        patched_monitoring._health_session.remove.assert_called_once_with()
+
+    def test_health_db_connection_reused(self, patched_monitoring):
+        """Test that repeated probes reuse pooled connections"""
+        engine = create_engine(
+            "sqlite://",
+            poolclass=QueuePool,
+            pool_size=2,
+            connect_args={"check_same_thread": False}
+        )
+        connects = []
+        event.listen(engine, "connect", lambda *args: connects.append(1))
+
+        health_session = scoped_session(sessionmaker(bind=engine, autoflush=False))
+        patched_monitoring._health_session.side_effect = health_session
+        patched_monitoring._health_session.remove.side_effect = health_session.remove
+
+        def check_database(db):
+            db.execute(text("SELECT 1"))
+            return {"status": "healthy"}
+
+        patched_monitoring.check_database.side_effect = check_database
+        patched_monitoring.check_redis.return_value = {"status": "healthy"}
+        patched_monitoring.check_disk_space.return_value = {"status": "healthy"}
+        patched_monitoring.check_memory.return_value = {"status": "healthy"}
+
+        for _ in range(100):
+            HealthCheck.get_comprehensive_health()
+
+        assert 0 < len(connects) <= 2
+
+    def test_comprehensive_health_short_circuits_on_unhealthy(self, patched_monitoring):
+        """Test that fail_fast skips remaining checks after an unhealthy one"""
+        patched_monitoring.check_database.return_value = {"status": "unhealthy", "message": "Failed"}
+
+        result = HealthCheck.get_comprehensive_health(fail_fast=True)
+
+        assert result["status"] == "unhealthy"
+        assert patched_monitoring.check_redis.called is False
+        assert patched_monitoring.check_disk_space.called is False
+        assert patched_monitoring.check_memory.called is False
+        assert result["checks"]["redis"]["status"] == "unknown"
+        patched_monitoring._health_session.remove.assert_called_once_with()
+
+    def test_comprehensive_health_runs_checks_concurrently(self, patched_monitoring):
+        """Test that all four probes run at the same time"""
+        # Each probe blocks until all four are running
+        barrier = threading.Barrier(4, timeout=5)
+
+        def probe(*args):
+            barrier.wait()
+            return {"status": "healthy"}
+
+        patched_monitoring.check_database.side_effect = probe
+        patched_monitoring.check_redis.side_effect = probe
+        patched_monitoring.check_disk_space.side_effect = probe
+        patched_monitoring.check_memory.side_effect = probe
+
+        result = HealthCheck.get_comprehensive_health()
+
+        assert result["status"] == "healthy"
+        assert list(result["checks"]) == ["database", "redis", "disk", "memory"]
 
 
 class TestSetAppInfo:
@@ -461,6 +662,27 @@ class TestSetAppInfo:
 
         # Should not raise exception
 
+    @patch('app.monitoring.application_info')
+    def test_set_app_info_idempotent(self, mock_info, monkeypatch):
+        """Test that repeated calls with the same values only set the metric once"""
+        monkeypatch.setattr('app.monitoring._last_app_info', None)
+
+        for _ in range(100):
+            set_app_info(version="3.0.0", environment="production")
+
+        assert mock_info.labels.call_count == 1
+        assert mock_info.labels.return_value.set.call_count == 1
+
+    @patch('app.monitoring.application_info')
+    def test_set_app_info_updates_on_change(self, mock_info, monkeypatch):
+        """Test that changed values are applied"""
+        monkeypatch.setattr('app.monitoring._last_app_info', None)
+
+        set_app_info(version="3.0.0", environment="production")
+        set_app_info(version="3.0.1", environment="production")
+
+        assert mock_info.labels.call_count == 2
+
 
 class TestPrometheusMetrics:
     """Tests for Prometheus metrics"""
@@ -514,6 +736,38 @@ class TestPrometheusMetrics:
         assert system_memory_usage is not None
         assert system_memory_usage._name == 'system_memory_usage_percent'
 
+    def test_system_disk_usage_exists(self):
+        """Test that system_disk_usage metric exists"""
+        from app.monitoring import system_disk_usage
+
+        assert system_disk_usage is not None
+        assert system_disk_usage._name == 'system_disk_usage_percent'
+
+    def test_app_metrics_registered_on_app_registry(self):
+        """Test that the app's metrics live on the dedicated registry"""
+        names = APP_REGISTRY._names_to_collectors
+
+        assert 'http_requests_total' in names
+        assert 'http_request_duration_seconds' in names
+        assert 'system_cpu_usage_percent' in names
+        assert 'application_info' in names
+
+    def test_app_registry_excludes_default_collectors(self):
+        """Test that process/platform collectors are not serialized"""
+        names = APP_REGISTRY._names_to_collectors
+
+        assert not any(name.startswith(('process_', 'python_')) for name in names)
+
+    @patch('app.monitoring.collect_system_metrics')
+    @patch('app.monitoring.generate_latest')
+    def test_get_metrics_uses_app_registry(self, mock_generate, mock_collect):
+        """Test that get_metrics serializes only the app registry"""
+        mock_generate.return_value = b"metrics"
+
+        get_metrics()
+
+        mock_generate.assert_called_once_with(APP_REGISTRY)
+
 
 class TestMetricLabels:
     """Tests for metric labels"""
@@ -550,3 +804,49 @@ class TestMetricLabels:
         label_names = cache_operations_total._labelnames
         assert 'operation' in label_names
         assert 'status' in label_names
+
+    def test_prebound_children_exist(self):
+        """Test that health probe children are bound at import time"""
+        from app.monitoring import _http_request_children, http_requests_total
+
+        requests_child, _ = _http_request_children[('GET', '/health', 200)]
+        assert requests_child is http_requests_total.labels(
+            method='GET', endpoint='/health', status=200
+        )
+
+    def test_record_request_reuses_children(self):
+        """Test that repeated requests reuse the same bound children"""
+        from app.monitoring import (
+            _http_request_children, http_requests_total, record_request
+        )
+
+        # The counter is process-global, so measure the increase
+        before = http_requests_total.labels(
+            method='POST', endpoint='/api/compare', status=201
+        )._value.get()
+
+        record_request('POST', '/api/compare', 201, 0.05)
+        children = _http_request_children[('POST', '/api/compare', 201)]
+        record_request('POST', '/api/compare', 201, 0.07)
+
+        assert _http_request_children[('POST', '/api/compare', 201)] is children
+        assert children[0]._value.get() == before + 2
+
+    def test_request_children_cache_is_capped(self, monkeypatch):
+        """Test that paths beyond the cache cap are recorded but not cached"""
+        from app.monitoring import (
+            _http_request_children, http_requests_total, record_request
+        )
+
+        counter = http_requests_total.labels(
+            method='GET', endpoint='/api/products/UNCACHED1', status=404
+        )
+        before = counter._value.get()
+
+        monkeypatch.setattr(
+            'app.monitoring.HTTP_REQUEST_CHILDREN_MAX', len(_http_request_children)
+        )
+        record_request('GET', '/api/products/UNCACHED1', 404, 0.01)
+
+        assert ('GET', '/api/products/UNCACHED1', 404) not in _http_request_children
+        assert counter._value.get() == before + 1
@@ -11,12 +11,70 @@ This module tests:
 import pytest
 from datetime import datetime, timedelta
 from decimal import Decimal
-from unittest.mock import Mock, MagicMock
+
+from sqlalchemy import insert
 
 from app.services.price_history import PriceHistoryService
 from app.models import Product, PriceHistory
 
 
+# Service methods bound once for the whole module
+record_price = PriceHistoryService.record_price
+get_price_history = PriceHistoryService.get_price_history
+get_price_statistics = PriceHistoryService.get_price_statistics
+get_best_price_time = PriceHistoryService.get_best_price_time
+get_price_drop_alerts = PriceHistoryService.get_price_drop_alerts
+
+# Prices passed to record_price, whose results are compared as Decimals
+P_4999, P_5499, P_54995 = map(Decimal, ("49.99", "54.99", "54.995"))
+UNIT_PRICE = Decimal("0.69")
+
+# Prices only read back through the service, which returns floats
+P_4000, P_4200, P_4500, P_4750, P_5000, P_5050, P_5100, P_6000 = (
+    40.00, 42.00, 45.00, 47.50, 50.00, 50.50, 51.00, 60.00
+)
+
+# Offsets from the reference timestamp used for recorded_at
+TD_3D, TD_5D, TD_10D, TD_20D, TD_40D = (timedelta(days=d) for d in (3, 5, 10, 20, 40))
+TD_12H, TD_48H, TD_50H = (timedelta(hours=h) for h in (12, 48, 50))
+
+
+@pytest.fixture
+def history_now():
+    """Single reference timestamp shared by every row a test creates"""
+    return datetime.now()
+
+
+def _bulk_price_history(db_session, product, rows):
+    """Insert price history rows for a product in one batch and commit"""
+    db_session.bulk_insert_mappings(PriceHistory, [
+        {"product_id": product.id, "asin": product.asin, **row}
+        for row in rows
+    ])
+    db_session.commit()
+
+
+def _soa_rows(product, prices, offsets_hours, history_now):
+    """Zip parallel price and hours-ago lists into insert rows for a product"""
+    return [
+        {"product_id": product.id, "asin": product.asin,
+         "price": price, "recorded_at": history_now - timedelta(hours=hours)}
+        for price, hours in zip(prices, offsets_hours)
+    ]
+
+
+def _two_prices(db_session, product, history_now, old_price, old_offset, new_price,
+                new_offset=timedelta(0)):
+    """Insert an old and a new price for a product in one executemany and commit"""
+    db_session.execute(insert(PriceHistory), [
+        {"product_id": product.id, "asin": product.asin,
+         "price": old_price, "recorded_at": history_now - old_offset},
+        {"product_id": product.id, "asin": product.asin,
+         "price": new_price, "recorded_at": history_now - new_offset},
+    ])
+    db_session.commit()
+
+
 class TestRecordPrice:
     """Tests for record_price method"""
 
@@ -25,116 +83,72 @@ class TestRecordPrice:
         # Create a product
         product = Product(asin="TEST123", title="Test Product")
         db_session.add(product)
-        db_session.commit()
+        db_session.flush()
 
         # Record price
-        price_record = PriceHistoryService.record_price(
+        price_record = record_price(
             db=db_session,
             product_id=product.id,
-            price=Decimal("54.99"),
-            unit_price=Decimal("0.69"),
+            price=P_5499,
+            unit_price=UNIT_PRICE,
             is_prime=True
         )
 
         assert price_record is not None
         assert price_record.product_id == product.id
-        assert price_record.price == Decimal("54.99")
-        assert price_record.unit_price == Decimal("0.69")
+        assert price_record.price == P_5499
+        assert price_record.unit_price == UNIT_PRICE
         assert price_record.is_prime is True
 
-    def test_record_price_unchanged(self, db_session):
-        """Test that unchanged price within 24h is not recorded"""
-        # Create product and initial price
-        product = Product(asin="TEST123", title="Test Product")
-        db_session.add(product)
-        db_session.commit()
-
-        # Record first price
-        first_record = PriceHistoryService.record_price(
-            db=db_session,
-            product_id=product.id,
-            price=Decimal("54.99")
-        )
-
-        # Try to record same price immediately
-        second_record = PriceHistoryService.record_price(
-            db=db_session,
-            product_id=product.id,
-            price=Decimal("54.99")
-        )
-
-        # Should return the same record
-        assert first_record.id == second_record.id
-
-    def test_record_price_changed(self, db_session):
-        """Test that changed price is recorded"""
-        # Create product and initial price
-        product = Product(asin="TEST123", title="Test Product")
-        db_session.add(product)
-        db_session.commit()
-
-        # Record first price
-        first_record = PriceHistoryService.record_price(
-            db=db_session,
-            product_id=product.id,
-            price=Decimal("54.99")
-        )
-
-        # Record different price
-        second_record = PriceHistoryService.record_price(
-            db=db_session,
-            product_id=product.id,
-            price=Decimal("49.99")
-        )
-
-        # Should create new record
-        assert first_record.id != second_record.id
-        assert second_record.price == Decimal("49.99")
-
     def test_record_price_with_all_fields(self, db_session):
         """Test recording price with all optional fields"""
         product = Product(asin="TEST123", title="Test Product")
         db_session.add(product)
-        db_session.commit()
+        db_session.flush()
 
-        price_record = PriceHistoryService.record_price(
+        price_record = record_price(
             db=db_session,
             product_id=product.id,
-            price=Decimal("54.99"),
-            unit_price=Decimal("0.69"),
+            price=P_5499,
+            unit_price=UNIT_PRICE,
             is_prime=True,
             is_sponsored=True,
             in_stock=False
         )
 
-        assert price_record.price == Decimal("54.99")
-        assert price_record.unit_price == Decimal("0.69")
+        assert price_record.price == P_5499
+        assert price_record.unit_price == UNIT_PRICE
         assert price_record.is_prime is True
         assert price_record.is_sponsored is True
         assert price_record.in_stock is False
 
-    def test_record_price_small_change(self, db_session):
-        """Test that very small price changes (< $0.01) are not recorded"""
+    @pytest.mark.parametrize("second_price,expect_same", [
+        (P_5499, True),    # unchanged within 24h
+        (P_4999, False),   # changed price
+        (P_54995, True),   # change < $0.01
+    ], ids=["unchanged", "changed", "small_change"])
+    def test_record_price_second_call(self, db_session, second_price, expect_same):
+        """Test that a second price is only recorded when it changed significantly"""
         product = Product(asin="TEST123", title="Test Product")
         db_session.add(product)
-        db_session.commit()
+        db_session.flush()
 
         # Record first price
-        first_record = PriceHistoryService.record_price(
+        first_record = record_price(
             db=db_session,
             product_id=product.id,
-            price=Decimal("54.99")
+            price=P_5499
         )
 
-        # Try to record price with tiny difference
-        second_record = PriceHistoryService.record_price(
+        second_record = record_price(
             db=db_session,
             product_id=product.id,
-            price=Decimal("54.995")
+            price=second_price
         )
 
-        # Should return same record (change < 0.01)
-        assert first_record.id == second_record.id
+        assert (first_record.id == second_record.id) == expect_same
+        if not expect_same:
+            assert second_record.price == second_price
 
 
 class TestGetPriceHistory:
@@ -144,9 +158,9 @@ class TestGetPriceHistory:
         """Test getting price history for product with no history"""
         product = Product(asin="TEST123", title="Test Product")
         db_session.add(product)
-        db_session.commit()
+        db_session.flush()
 
-        history = PriceHistoryService.get_price_history(
+        history = get_price_history(
             db=db_session,
             product_id=product.id,
             days=30
@@ -154,61 +168,35 @@ class TestGetPriceHistory:
 
         assert history == []
 
-    def test_get_price_history_with_records(self, db_session):
+    def test_get_price_history_with_records(self, seeded_product):
         """Test getting price history with multiple records"""
-        product = Product(asin="TEST123", title="Test Product")
-        db_session.add(product)
-        db_session.commit()
-
-        # Create multiple price records
-        prices = [
-            (Decimal("54.99"), datetime.now() - timedelta(days=5)),
-            (Decimal("49.99"), datetime.now() - timedelta(days=3)),
-            (Decimal("44.99"), datetime.now() - timedelta(days=1))
-        ]
-
-        for price, timestamp in prices:
-            record = PriceHistory(
-                product_id=product.id,
-                price=price,
-                recorded_at=timestamp
-            )
-            db_session.add(record)
-        db_session.commit()
+        product_id, session = seeded_product
 
-        history = PriceHistoryService.get_price_history(
-            db=db_session,
-            product_id=product.id,
+        history = get_price_history(
+            db=session,
+            product_id=product_id,
             days=30
         )
 
         assert len(history) == 3
         # Should be ordered by date ascending
-        assert history[0]["price"] == 54.99
-        assert history[-1]["price"] == 44.99
+        assert history[0]["price"] == 60.00
+        assert history[-1]["price"] == 50.00
 
-    def test_get_price_history_respects_days_filter(self, db_session):
+    def test_get_price_history_respects_days_filter(self, db_session, history_now):
         """Test that days parameter filters old records"""
         product = Product(asin="TEST123", title="Test Product")
         db_session.add(product)
-        db_session.commit()
+        db_session.flush()
 
         # Create records: one recent, one old
-        recent_record = PriceHistory(
-            product_id=product.id,
-            price=Decimal("49.99"),
-            recorded_at=datetime.now() - timedelta(days=5)
-        )
-        old_record = PriceHistory(
-            product_id=product.id,
-            price=Decimal("54.99"),
-            recorded_at=datetime.now() - timedelta(days=40)
-        )
-        db_session.add_all([recent_record, old_record])
-        db_session.commit()
+        _bulk_price_history(db_session, product, [
+            {"price": P_4999, "recorded_at": history_now - TD_5D},
+            {"price": P_5499, "recorded_at": history_now - TD_40D}
+        ])
 
         # Get history for last 30 days
-        history = PriceHistoryService.get_price_history(
+        history = get_price_history(
             db=db_session,
             product_id=product.id,
             days=30
@@ -218,36 +206,29 @@ class TestGetPriceHistory:
         assert len(history) == 1
         assert history[0]["price"] == 49.99
 
-    def test_get_price_history_includes_all_fields(self, db_session):
+    def test_get_price_history_includes_all_fields(self, db_session, history_now):
         """Test that history includes all record fields"""
         product = Product(asin="TEST123", title="Test Product")
         db_session.add(product)
-        db_session.commit()
-
-        record = PriceHistory(
-            product_id=product.id,
-            price=Decimal("54.99"),
-            unit_price=Decimal("0.69"),
-            is_prime=True,
-            is_sponsored=False,
-            in_stock=True,
-            recorded_at=datetime.now()
-        )
-        db_session.add(record)
-        db_session.commit()
-
-        history = PriceHistoryService.get_price_history(
+        db_session.flush()
+
+        _bulk_price_history(db_session, product, [{
+            "price": P_5499,
+            "unit_price": UNIT_PRICE,
+            "is_prime": True,
+            "is_sponsored": False,
+            "in_stock": True,
+            "recorded_at": history_now
+        }])
+
+        history = get_price_history(
             db=db_session,
             product_id=product.id
         )
 
         assert len(history) == 1
-        assert "date" in history[0]
-        assert "price" in history[0]
-        assert "unit_price" in history[0]
-        assert "is_prime" in history[0]
-        assert "is_sponsored" in history[0]
-        assert "in_stock" in history[0]
+        expected = {"date", "price", "unit_price", "is_prime", "is_sponsored", "in_stock"}
+        assert expected <= history[0].keys()
 
 
 class TestGetPriceStatistics:
@@ -257,9 +238,9 @@ class TestGetPriceStatistics:
         """Test price statistics with no price history"""
         product = Product(asin="TEST123", title="Test Product")
         db_session.add(product)
-        db_session.commit()
+        db_session.flush()
 
-        stats = PriceHistoryService.get_price_statistics(
+        stats = get_price_statistics(
             db=db_session,
             product_id=product.id,
             days=30
@@ -270,26 +251,13 @@ class TestGetPriceStatistics:
         assert stats["avg_price"] is None
         assert stats["data_points"] == 0
 
-    def test_price_statistics_calculates_correctly(self, db_session):
+    def test_price_statistics_calculates_correctly(self, seeded_product):
         """Test price statistics calculations"""
-        product = Product(asin="TEST123", title="Test Product")
-        db_session.add(product)
-        db_session.commit()
+        product_id, session = seeded_product
 
-        # Create price records
-        prices = [Decimal("50.00"), Decimal("60.00"), Decimal("40.00")]
-        for i, price in enumerate(prices):
-            record = PriceHistory(
-                product_id=product.id,
-                price=price,
-                recorded_at=datetime.now() - timedelta(days=i)
-            )
-            db_session.add(record)
-        db_session.commit()
-
-        stats = PriceHistoryService.get_price_statistics(
-            db=db_session,
-            product_id=product.id,
+        stats = get_price_statistics(
+            db=session,
+            product_id=product_id,
             days=30
         )
 
@@ -298,28 +266,20 @@ class TestGetPriceStatistics:
         assert stats["avg_price"] == 50.00  # (50+60+40)/3
         assert stats["data_points"] == 3
 
-    def test_price_statistics_current_price(self, db_session):
+    def test_price_statistics_current_price(self, db_session, history_now):
         """Test that statistics includes current price"""
         product = Product(asin="TEST123", title="Test Product")
         db_session.add(product)
-        db_session.commit()
+        db_session.flush()
 
         # Add older price
-        old_record = PriceHistory(
-            product_id=product.id,
-            price=Decimal("60.00"),
-            recorded_at=datetime.now() - timedelta(days=5)
-        )
-        # Add current price
-        current_record = PriceHistory(
-            product_id=product.id,
-            price=Decimal("50.00"),
-            recorded_at=datetime.now()
-        )
-        db_session.add_all([old_record, current_record])
-        db_session.commit()
+        _bulk_price_history(db_session, product, [
+            {"price": P_6000, "recorded_at": history_now - TD_5D},
+            # Add current price
+            {"price": P_5000, "recorded_at": history_now}
+        ])
 
-        stats = PriceHistoryService.get_price_statistics(
+        stats = get_price_statistics(
             db=db_session,
             product_id=product.id,
             days=30
@@ -327,27 +287,19 @@ class TestGetPriceStatistics:
 
         assert stats["current_price"] == 50.00
 
-    def test_price_statistics_is_lowest(self, db_session):
+    def test_price_statistics_is_lowest(self, db_session, history_now):
         """Test is_lowest flag when current price is lowest"""
         product = Product(asin="TEST123", title="Test Product")
         db_session.add(product)
-        db_session.commit()
+        db_session.flush()
 
         # Current price is lowest
-        record1 = PriceHistory(
-            product_id=product.id,
-            price=Decimal("60.00"),
-            recorded_at=datetime.now() - timedelta(days=5)
-        )
-        record2 = PriceHistory(
-            product_id=product.id,
-            price=Decimal("45.00"),
-            recorded_at=datetime.now()
-        )
-        db_session.add_all([record1, record2])
-        db_session.commit()
+        _bulk_price_history(db_session, product, [
+            {"price": P_6000, "recorded_at": history_now - TD_5D},
+            {"price": P_4500, "recorded_at": history_now}
+        ])
 
-        stats = PriceHistoryService.get_price_statistics(
+        stats = get_price_statistics(
             db=db_session,
             product_id=product.id
         )
@@ -355,27 +307,19 @@ class TestGetPriceStatistics:
         assert stats["is_lowest"] is True
         assert stats["is_highest"] is False
 
-    def test_price_statistics_trend(self, db_session):
+    def test_price_statistics_trend(self, db_session, history_now):
         """Test price trend calculation"""
         product = Product(asin="TEST123", title="Test Product")
         db_session.add(product)
-        db_session.commit()
+        db_session.flush()
 
         # Price dropped from 60 to 50 (>5% drop = "down")
-        old_record = PriceHistory(
-            product_id=product.id,
-            price=Decimal("60.00"),
-            recorded_at=datetime.now() - timedelta(days=10)
-        )
-        current_record = PriceHistory(
-            product_id=product.id,
-            price=Decimal("50.00"),
-            recorded_at=datetime.now()
-        )
-        db_session.add_all([old_record, current_record])
-        db_session.commit()
+        _bulk_price_history(db_session, product, [
+            {"price": P_6000, "recorded_at": history_now - TD_10D},
+            {"price": P_5000, "recorded_at": history_now}
+        ])
 
-        stats = PriceHistoryService.get_price_statistics(
+        stats = get_price_statistics(
             db=db_session,
             product_id=product.id
         )
@@ -384,27 +328,19 @@ class TestGetPriceStatistics:
         assert stats["price_change_pct"] < -5
         assert stats["trend"] == "down"
 
-    def test_price_statistics_stable_trend(self, db_session):
+    def test_price_statistics_stable_trend(self, db_session, history_now):
         """Test stable price trend"""
         product = Product(asin="TEST123", title="Test Product")
         db_session.add(product)
-        db_session.commit()
+        db_session.flush()
 
         # Price changed slightly (within -5% to +5% = "stable")
-        old_record = PriceHistory(
-            product_id=product.id,
-            price=Decimal("50.00"),
-            recorded_at=datetime.now() - timedelta(days=10)
-        )
-        current_record = PriceHistory(
-            product_id=product.id,
-            price=Decimal("51.00"),
-            recorded_at=datetime.now()
-        )
-        db_session.add_all([old_record, current_record])
-        db_session.commit()
+        _bulk_price_history(db_session, product, [
+            {"price": P_5000, "recorded_at": history_now - TD_10D},
+            {"price": P_5100, "recorded_at": history_now}
+        ])
 
-        stats = PriceHistoryService.get_price_statistics(
+        stats = get_price_statistics(
             db=db_session,
             product_id=product.id
         )
@@ -420,9 +356,9 @@ class TestGetBestPriceTime:
         """Test best price time with no history"""
         product = Product(asin="TEST123", title="Test Product")
         db_session.add(product)
-        db_session.commit()
+        db_session.flush()
 
-        result = PriceHistoryService.get_best_price_time(
+        result = get_best_price_time(
             db=db_session,
             product_id=product.id
         )
@@ -431,57 +367,31 @@ class TestGetBestPriceTime:
         assert result["best_price_date"] is None
         assert result["days_ago"] is None
 
-    def test_best_price_time_finds_lowest(self, db_session):
+    def test_best_price_time_finds_lowest(self, seeded_product):
         """Test that best price time finds the lowest price"""
-        product = Product(asin="TEST123", title="Test Product")
-        db_session.add(product)
-        db_session.commit()
+        product_id, session = seeded_product
 
-        # Create price records with different prices
-        prices_and_days = [
-            (Decimal("60.00"), 10),
-            (Decimal("45.00"), 5),  # Lowest
-            (Decimal("55.00"), 1)
-        ]
-
-        for price, days_ago in prices_and_days:
-            record = PriceHistory(
-                product_id=product.id,
-                price=price,
-                recorded_at=datetime.now() - timedelta(days=days_ago)
-            )
-            db_session.add(record)
-        db_session.commit()
-
-        result = PriceHistoryService.get_best_price_time(
-            db=db_session,
-            product_id=product.id
+        result = get_best_price_time(
+            db=session,
+            product_id=product_id
         )
 
-        assert result["best_price"] == 45.00
+        assert result["best_price"] == 40.00
         assert result["days_ago"] == 5
 
-    def test_best_price_time_calculates_savings(self, db_session):
+    def test_best_price_time_calculates_savings(self, db_session, history_now):
         """Test savings calculation from current price"""
         product = Product(asin="TEST123", title="Test Product")
         db_session.add(product)
-        db_session.commit()
+        db_session.flush()
 
         # Best price was 40, current is 50
-        best_record = PriceHistory(
-            product_id=product.id,
-            price=Decimal("40.00"),
-            recorded_at=datetime.now() - timedelta(days=10)
-        )
-        current_record = PriceHistory(
-            product_id=product.id,
-            price=Decimal("50.00"),
-            recorded_at=datetime.now()
-        )
-        db_session.add_all([best_record, current_record])
-        db_session.commit()
+        _bulk_price_history(db_session, product, [
+            {"price": P_4000, "recorded_at": history_now - TD_10D},
+            {"price": P_5000, "recorded_at": history_now}
+        ])
 
-        result = PriceHistoryService.get_best_price_time(
+        result = get_best_price_time(
             db=db_session,
             product_id=product.id
         )
@@ -489,27 +399,19 @@ class TestGetBestPriceTime:
         # Savings = current - best = 50 - 40 = 10
         assert result["savings_from_current"] == 10.00
 
-    def test_best_price_time_recommendation_buy_now(self, db_session):
+    def test_best_price_time_recommendation_buy_now(self, db_session, history_now):
         """Test 'Buy now' recommendation when at/near best price"""
         product = Product(asin="TEST123", title="Test Product")
         db_session.add(product)
-        db_session.commit()
+        db_session.flush()
 
         # Best price was 50 recently (< 7 days), current is 50.50
-        best_record = PriceHistory(
-            product_id=product.id,
-            price=Decimal("50.00"),
-            recorded_at=datetime.now() - timedelta(days=3)
-        )
-        current_record = PriceHistory(
-            product_id=product.id,
-            price=Decimal("50.50"),
-            recorded_at=datetime.now()
-        )
-        db_session.add_all([best_record, current_record])
-        db_session.commit()
+        _bulk_price_history(db_session, product, [
+            {"price": P_5000, "recorded_at": history_now - TD_3D},
+            {"price": P_5050, "recorded_at": history_now}
+        ])
 
-        result = PriceHistoryService.get_best_price_time(
+        result = get_best_price_time(
             db=db_session,
             product_id=product.id
         )
@@ -517,27 +419,19 @@ class TestGetBestPriceTime:
         # Recent best price (<7 days) + small difference (<$1)
         assert result["recommendation"] == "Buy now!"
 
-    def test_best_price_time_recommendation_wait(self, db_session):
+    def test_best_price_time_recommendation_wait(self, db_session, history_now):
         """Test 'Wait' recommendation when price is high"""
         product = Product(asin="TEST123", title="Test Product")
         db_session.add(product)
-        db_session.commit()
+        db_session.flush()
 
         # Best price was 40, current is 50 (savings > $5)
-        best_record = PriceHistory(
-            product_id=product.id,
-            price=Decimal("40.00"),
-            recorded_at=datetime.now() - timedelta(days=20)
-        )
-        current_record = PriceHistory(
-            product_id=product.id,
-            price=Decimal("50.00"),
-            recorded_at=datetime.now()
-        )
-        db_session.add_all([best_record, current_record])
-        db_session.commit()
+        _bulk_price_history(db_session, product, [
+            {"price": P_4000, "recorded_at": history_now - TD_20D},
+            {"price": P_5000, "recorded_at": history_now}
+        ])
 
-        result = PriceHistoryService.get_best_price_time(
+        result = get_best_price_time(
             db=db_session,
             product_id=product.id
         )
@@ -549,27 +443,16 @@ class TestGetBestPriceTime:
 class TestGetPriceDropAlerts:
     """Tests for get_price_drop_alerts method"""
 
-    def test_price_drop_alerts_no_drops(self, db_session):
+    def test_price_drop_alerts_no_drops(self, db_session, history_now):
         """Test when there are no price drops"""
         product = Product(asin="TEST123", title="Test Product")
         db_session.add(product)
-        db_session.commit()
+        db_session.flush()
 
         # Price went up, not down
-        old_record = PriceHistory(
-            product_id=product.id,
-            price=Decimal("50.00"),
-            recorded_at=datetime.now() - timedelta(hours=12)
-        )
-        new_record = PriceHistory(
-            product_id=product.id,
-            price=Decimal("60.00"),
-            recorded_at=datetime.now()
-        )
-        db_session.add_all([old_record, new_record])
-        db_session.commit()
+        _two_prices(db_session, product, history_now, P_5000, TD_12H, P_6000)
 
-        alerts = PriceHistoryService.get_price_drop_alerts(
+        alerts = get_price_drop_alerts(
             db=db_session,
             min_drop_percentage=10.0,
             hours=24
@@ -577,61 +460,41 @@ class TestGetPriceDropAlerts:
 
         assert len(alerts) == 0
 
-    def test_price_drop_alerts_finds_drops(self, db_session):
+    def test_price_drop_alerts_finds_drops(self, db_session, history_now):
         """Test finding products with price drops"""
         product = Product(asin="TEST123", title="Test Product")
         db_session.add(product)
-        db_session.commit()
+        db_session.flush()
 
         # Price dropped 20% (from 50 to 40)
-        old_record = PriceHistory(
-            product_id=product.id,
-            price=Decimal("50.00"),
-            recorded_at=datetime.now() - timedelta(hours=12)
-        )
-        new_record = PriceHistory(
-            product_id=product.id,
-            price=Decimal("40.00"),
-            recorded_at=datetime.now()
-        )
-        db_session.add_all([old_record, new_record])
-        db_session.commit()
+        _two_prices(db_session, product, history_now, P_5000, TD_12H, P_4000)
 
-        alerts = PriceHistoryService.get_price_drop_alerts(
+        alerts = get_price_drop_alerts(
             db=db_session,
             min_drop_percentage=10.0,
             hours=24
         )
 
         assert len(alerts) == 1
-        assert alerts[0]["asin"] == "TEST123"
-        assert alerts[0]["old_price"] == 50.00
-        assert alerts[0]["new_price"] == 40.00
-        assert alerts[0]["drop_percentage"] == 20.00
-        assert alerts[0]["savings"] == 10.00
-
-    def test_price_drop_alerts_respects_threshold(self, db_session):
+        assert {
+            "asin": "TEST123",
+            "old_price": 50.00,
+            "new_price": 40.00,
+            "drop_percentage": 20.00,
+            "savings": 10.00
+        }.items() <= alerts[0].items()
+
+    def test_price_drop_alerts_respects_threshold(self, db_session, history_now):
         """Test that minimum drop percentage is respected"""
         product = Product(asin="TEST123", title="Test Product")
         db_session.add(product)
-        db_session.commit()
+        db_session.flush()
 
         # Price dropped 5% (from 50 to 47.50)
-        old_record = PriceHistory(
-            product_id=product.id,
-            price=Decimal("50.00"),
-            recorded_at=datetime.now() - timedelta(hours=12)
-        )
-        new_record = PriceHistory(
-            product_id=product.id,
-            price=Decimal("47.50"),
-            recorded_at=datetime.now()
-        )
-        db_session.add_all([old_record, new_record])
-        db_session.commit()
+        _two_prices(db_session, product, history_now, P_5000, TD_12H, P_4750)
 
         # Look for drops >= 10%
-        alerts = PriceHistoryService.get_price_drop_alerts(
+        alerts = get_price_drop_alerts(
             db=db_session,
             min_drop_percentage=10.0,
             hours=24
@@ -640,44 +503,24 @@ class TestGetPriceDropAlerts:
         # 5% drop should not trigger 10% threshold
         assert len(alerts) == 0
 
-    def test_price_drop_alerts_sorted_by_percentage(self, db_session):
+    def test_price_drop_alerts_sorted_by_percentage(self, db_session, history_now):
         """Test that alerts are sorted by drop percentage"""
         # Create two products with different drop percentages
         product1 = Product(asin="TEST1", title="Product 1")
         product2 = Product(asin="TEST2", title="Product 2")
         db_session.add_all([product1, product2])
-        db_session.commit()
+        db_session.flush()
 
-        # Product 1: 20% drop
-        db_session.add_all([
-            PriceHistory(
-                product_id=product1.id,
-                price=Decimal("50.00"),
-                recorded_at=datetime.now() - timedelta(hours=12)
-            ),
-            PriceHistory(
-                product_id=product1.id,
-                price=Decimal("40.00"),
-                recorded_at=datetime.now()
-            )
-        ])
-
-        # Product 2: 30% drop
-        db_session.add_all([
-            PriceHistory(
-                product_id=product2.id,
-                price=Decimal("60.00"),
-                recorded_at=datetime.now() - timedelta(hours=12)
-            ),
-            PriceHistory(
-                product_id=product2.id,
-                price=Decimal("42.00"),
-                recorded_at=datetime.now()
-            )
-        ])
+        rows = (
+            # Product 1: 20% drop
+            _soa_rows(product1, [P_5000, P_4000], [12, 0], history_now)
+            # Product 2: 30% drop
+            + _soa_rows(product2, [P_6000, P_4200], [12, 0], history_now)
+        )
+        db_session.execute(insert(PriceHistory), rows)
         db_session.commit()
 
-        alerts = PriceHistoryService.get_price_drop_alerts(
+        alerts = get_price_drop_alerts(
             db=db_session,
             min_drop_percentage=10.0,
             hours=24
@@ -688,28 +531,17 @@ class TestGetPriceDropAlerts:
         assert alerts[0]["asin"] == "TEST2"  # 30% drop
         assert alerts[1]["asin"] == "TEST1"  # 20% drop
 
-    def test_price_drop_alerts_respects_time_window(self, db_session):
+    def test_price_drop_alerts_respects_time_window(self, db_session, history_now):
         """Test that time window parameter is respected"""
         product = Product(asin="TEST123", title="Test Product")
         db_session.add(product)
-        db_session.commit()
+        db_session.flush()
 
         # Price drop happened 48 hours ago
-        old_record = PriceHistory(
-            product_id=product.id,
-            price=Decimal("60.00"),
-            recorded_at=datetime.now() - timedelta(hours=50)
-        )
-        new_record = PriceHistory(
-            product_id=product.id,
-            price=Decimal("40.00"),
-            recorded_at=datetime.now() - timedelta(hours=48)
-        )
-        db_session.add_all([old_record, new_record])
-        db_session.commit()
+        _two_prices(db_session, product, history_now, P_6000, TD_50H, P_4000, TD_48H)
 
         # Look for drops in last 24 hours
-        alerts = PriceHistoryService.get_price_drop_alerts(
+        alerts = get_price_drop_alerts(
             db=db_session,
             min_drop_percentage=10.0,
             hours=24
@@ -10,7 +10,6 @@ This module tests:
 import pytest
 from pydantic import ValidationError
 from decimal import Decimal
-from datetime import datetime
 from typing import List
 
 from app.schemas import (
@@ -24,6 +23,17 @@ from app.schemas import (
     CompareRequest,
     CompareResponse
 )
+from tests._constants import PRICE_54_99, UNIT_0_50, UNIT_0_69, UNIT_1_00
+
+
+# Required ProductBase fields shared by the edge case tests
+EDGE_CASE_BASE = {"asin": "TEST", "title": "Test"}
+
+
+@pytest.fixture(scope="session")
+def search_validator():
+    """SearchRequest's compiled validator, shared by every test"""
+    return SearchRequest.__pydantic_validator__
 
 
 class TestProductBase:
@@ -49,9 +59,9 @@ class TestProductBase:
             title="Test Product",
             brand="Test Brand",
             category="Protein",
-            current_price=Decimal("54.99"),
+            current_price=PRICE_54_99,
             list_price=Decimal("69.99"),
-            unit_price=Decimal("0.69"),
+            unit_price=UNIT_0_69,
             unit_type="oz",
             quantity=Decimal("80"),
             discount_pct=Decimal("21.43"),
@@ -69,7 +79,7 @@ class TestProductBase:
         )
 
         assert product.asin == "B000QSO98W"
-        assert product.current_price == Decimal("54.99")
+        assert product.current_price == PRICE_54_99
         assert product.rating == Decimal("4.6")
         assert product.is_prime is True
 
@@ -97,18 +107,16 @@ class TestProductBase:
             unit_price="0.62"  # string
         )
 
-        assert isinstance(product.current_price, Decimal)
-        assert isinstance(product.rating, Decimal)
-        assert isinstance(product.unit_price, Decimal)
+        assert type(product.current_price) is Decimal
+        assert type(product.rating) is Decimal
+        assert type(product.unit_price) is Decimal
 
 
 class TestProductResponse:
     """Tests for ProductResponse schema"""
 
-    def test_product_response_with_timestamps(self):
+    def test_product_response_with_timestamps(self, now):
         """Test ProductResponse includes timestamp fields"""
-        now = datetime.now()
-
         product = ProductResponse(
             asin="B000QSO98W",
             title="Test Product",
@@ -121,10 +129,8 @@ class TestProductResponse:
         assert product.created_at == now
         assert product.updated_at == now
 
-    def test_product_response_computed_fields(self):
+    def test_product_response_computed_fields(self, now):
         """Test ProductResponse computed fields"""
-        now = datetime.now()
-
         product = ProductResponse(
             asin="B000QSO98W",
             title="Test Product",
@@ -142,9 +148,9 @@ class TestProductResponse:
 class TestSearchRequest:
     """Tests for SearchRequest validation"""
 
-    def test_search_request_minimal(self):
+    def test_search_request_minimal(self, search_validator):
         """Test search request with minimal fields"""
-        request = SearchRequest(q="protein")
+        request = search_validator.validate_python({"q": "protein"})
 
         assert request.q == "protein"
         assert request.sort == "unit_price_asc"
@@ -153,149 +159,139 @@ class TestSearchRequest:
         assert request.prime_only is False
         assert request.hide_sponsored is True
 
-    def test_search_request_empty_query_fails(self):
+    def test_search_request_empty_query_fails(self, search_validator):
         """Test that empty query is rejected"""
         with pytest.raises(ValidationError) as exc_info:
-            SearchRequest(q="")
+            search_validator.validate_python({"q": ""})
 
-        assert "q" in str(exc_info.value)
+        assert any(e["loc"] == ("q",) for e in exc_info.value.errors())
 
-    def test_search_request_valid_sort_options(self):
+    @pytest.mark.parametrize("sort_option", [
+        'unit_price_asc', 'unit_price_desc',
+        'price_asc', 'price_desc',
+        'discount_desc', 'rating_desc',
+        'review_count_desc', 'hidden_gem_desc'
+    ])
+    def test_search_request_valid_sort_options(self, search_validator, sort_option):
         """Test all valid sort options"""
-        valid_sorts = [
-            'unit_price_asc', 'unit_price_desc',
-            'price_asc', 'price_desc',
-            'discount_desc', 'rating_desc',
-            'review_count_desc', 'hidden_gem_desc'
-        ]
+        request = search_validator.validate_python({"q": "test", "sort": sort_option})
+        assert request.sort == sort_option
 
-        for sort_option in valid_sorts:
-            request = SearchRequest(q="test", sort=sort_option)
-            assert request.sort == sort_option
-
-    def test_search_request_invalid_sort_fails(self):
+    def test_search_request_invalid_sort_fails(self, search_validator):
         """Test that invalid sort option is rejected"""
         with pytest.raises(ValidationError) as exc_info:
-            SearchRequest(q="protein", sort="invalid_sort")
+            search_validator.validate_python({"q": "protein", "sort": "invalid_sort"})
 
-        assert "sort" in str(exc_info.value).lower()
+        assert any(e["loc"] == ("sort",) for e in exc_info.value.errors())
 
-    def test_search_request_price_filters(self):
+    def test_search_request_price_filters(self, search_validator):
         """Test price filter fields"""
-        request = SearchRequest(
-            q="protein",
-            min_price=Decimal("20.00"),
-            max_price=Decimal("60.00"),
-            min_unit_price=Decimal("0.50"),
-            max_unit_price=Decimal("1.00")
-        )
+        request = search_validator.validate_python({
+            "q": "protein",
+            "min_price": Decimal("20.00"),
+            "max_price": Decimal("60.00"),
+            "min_unit_price": UNIT_0_50,
+            "max_unit_price": UNIT_1_00
+        })
 
         assert request.min_price == Decimal("20.00")
         assert request.max_price == Decimal("60.00")
-        assert request.min_unit_price == Decimal("0.50")
-        assert request.max_unit_price == Decimal("1.00")
-
-    def test_search_request_rating_constraints(self):
-        """Test rating field constraints"""
-        # Valid ratings
-        for rating in [0, 2.5, 4.0, 5.0]:
-            request = SearchRequest(q="test", min_rating=rating)
-            assert request.min_rating == rating
-
-        # Invalid ratings
-        for invalid_rating in [-1, 5.1, 10]:
-            with pytest.raises(ValidationError):
-                SearchRequest(q="test", min_rating=invalid_rating)
-
-    def test_search_request_discount_constraints(self):
-        """Test discount field constraints"""
-        # Valid discounts
-        for discount in [0, 25, 50, 100]:
-            request = SearchRequest(q="test", min_discount=discount)
-            assert request.min_discount == discount
-
-        # Invalid discounts
-        for invalid_discount in [-1, 101, 200]:
-            with pytest.raises(ValidationError):
-                SearchRequest(q="test", min_discount=invalid_discount)
-
-    def test_search_request_page_constraints(self):
-        """Test page field constraints"""
-        # Valid pages
-        request = SearchRequest(q="test", page=1)
-        assert request.page == 1
-
-        request = SearchRequest(q="test", page=100)
-        assert request.page == 100
-
-        # Invalid pages
+        assert request.min_unit_price == UNIT_0_50
+        assert request.max_unit_price == UNIT_1_00
+
+    @pytest.mark.parametrize("rating", [0, 2.5, 4.0, 5.0])
+    def test_search_request_rating_constraints(self, search_validator, rating):
+        """Test valid rating values"""
+        request = search_validator.validate_python({"q": "test", "min_rating": rating})
+        assert request.min_rating == rating
+
+    @pytest.mark.parametrize("invalid_rating", [-1, 5.1, 10])
+    def test_search_request_invalid_rating_fails(self, search_validator, invalid_rating):
+        """Test that out of range ratings are rejected"""
         with pytest.raises(ValidationError):
-            SearchRequest(q="test", page=0)
+            search_validator.validate_python({"q": "test", "min_rating": invalid_rating})
 
-        with pytest.raises(ValidationError):
-            SearchRequest(q="test", page=-1)
+    @pytest.mark.parametrize("discount", [0, 25, 50, 100])
+    def test_search_request_discount_constraints(self, search_validator, discount):
+        """Test valid discount values"""
+        request = search_validator.validate_python({"q": "test", "min_discount": discount})
+        assert request.min_discount == discount
 
-    def test_search_request_limit_constraints(self):
-        """Test limit field constraints"""
-        # Valid limits
-        request = SearchRequest(q="test", limit=1)
-        assert request.limit == 1
+    @pytest.mark.parametrize("invalid_discount", [-1, 101, 200])
+    def test_search_request_invalid_discount_fails(self, search_validator, invalid_discount):
+        """Test that out of range discounts are rejected"""
+        with pytest.raises(ValidationError):
+            search_validator.validate_python({"q": "test", "min_discount": invalid_discount})
 
-        request = SearchRequest(q="test", limit=100)
-        assert request.limit == 100
+    @pytest.mark.parametrize("page", [1, 100])
+    def test_search_request_page_constraints(self, search_validator, page):
+        """Test valid page values"""
+        request = search_validator.validate_python({"q": "test", "page": page})
+        assert request.page == page
 
-        # Invalid limits
+    @pytest.mark.parametrize("invalid_page", [0, -1])
+    def test_search_request_invalid_page_fails(self, search_validator, invalid_page):
+        """Test that pages below 1 are rejected"""
         with pytest.raises(ValidationError):
-            SearchRequest(q="test", limit=0)
+            search_validator.validate_python({"q": "test", "page": invalid_page})
+
+    @pytest.mark.parametrize("limit", [1, 100])
+    def test_search_request_limit_constraints(self, search_validator, limit):
+        """Test valid limit values"""
+        request = search_validator.validate_python({"q": "test", "limit": limit})
+        assert request.limit == limit
 
+    @pytest.mark.parametrize("invalid_limit", [0, 101])
+    def test_search_request_invalid_limit_fails(self, search_validator, invalid_limit):
+        """Test that limits outside 1-100 are rejected"""
         with pytest.raises(ValidationError):
-            SearchRequest(q="test", limit=101)
+            search_validator.validate_python({"q": "test", "limit": invalid_limit})
 
-    def test_search_request_boolean_filters(self):
+    def test_search_request_boolean_filters(self, search_validator):
         """Test boolean filter fields"""
-        request = SearchRequest(
-            q="protein",
-            prime_only=True,
-            hide_sponsored=False,
-            in_stock_only=True
-        )
+        request = search_validator.validate_python({
+            "q": "protein",
+            "prime_only": True,
+            "hide_sponsored": False,
+            "in_stock_only": True
+        })
 
         assert request.prime_only is True
         assert request.hide_sponsored is False
         assert request.in_stock_only is True
 
-    def test_search_request_brand_filters(self):
+    def test_search_request_brand_filters(self, search_validator):
         """Test brand filter fields"""
-        request = SearchRequest(
-            q="protein",
-            brands=["Optimum Nutrition", "Dymatize"],
-            exclude_brands=["Generic Brand"]
-        )
+        request = search_validator.validate_python({
+            "q": "protein",
+            "brands": ["Optimum Nutrition", "Dymatize"],
+            "exclude_brands": ["Generic Brand"]
+        })
 
         assert len(request.brands) == 2
         assert "Optimum Nutrition" in request.brands
         assert len(request.exclude_brands) == 1
 
-    def test_search_request_comprehensive(self):
+    def test_search_request_comprehensive(self, search_validator):
         """Test search request with all filters"""
-        request = SearchRequest(
-            q="protein powder",
-            sort="unit_price_asc",
-            min_price=Decimal("30.00"),
-            max_price=Decimal("70.00"),
-            min_unit_price=Decimal("0.50"),
-            max_unit_price=Decimal("1.00"),
-            min_rating=Decimal("4.0"),
-            min_review_count=1000,
-            prime_only=True,
-            hide_sponsored=True,
-            min_discount=20,
-            brands=["Optimum Nutrition"],
-            exclude_brands=["Generic"],
-            in_stock_only=True,
-            page=2,
-            limit=24
-        )
+        request = search_validator.validate_python({
+            "q": "protein powder",
+            "sort": "unit_price_asc",
+            "min_price": Decimal("30.00"),
+            "max_price": Decimal("70.00"),
+            "min_unit_price": UNIT_0_50,
+            "max_unit_price": UNIT_1_00,
+            "min_rating": Decimal("4.0"),
+            "min_review_count": 1000,
+            "prime_only": True,
+            "hide_sponsored": True,
+            "min_discount": 20,
+            "brands": ["Optimum Nutrition"],
+            "exclude_brands": ["Generic"],
+            "in_stock_only": True,
+            "page": 2,
+            "limit": 24
+        })
 
         assert request.q == "protein powder"
         assert request.min_rating == Decimal("4.0")
@@ -319,20 +315,9 @@ class TestSearchResponse:
         assert response.total == 0
         assert response.pages == 0
 
-    def test_search_response_with_results(self):
+    def test_search_response_with_results(self, sample_product_responses):
         """Test search response with results"""
-        now = datetime.now()
-
-        products = [
-            ProductResponse(
-                asin=f"TEST{i}",
-                title=f"Product {i}",
-                last_scraped_at=now,
-                created_at=now,
-                updated_at=now
-            )
-            for i in range(5)
-        ]
+        products = sample_product_responses[:5]
 
         response = SearchResponse(
             results=products,
@@ -352,31 +337,27 @@ class TestSearchResponse:
 class TestPriceHistoryResponse:
     """Tests for PriceHistoryResponse schema"""
 
-    def test_price_history_response(self):
+    def test_price_history_response(self, now):
         """Test price history response"""
-        now = datetime.now()
-
         history = PriceHistoryResponse(
             id=1,
             asin="B000QSO98W",
-            price=Decimal("54.99"),
-            unit_price=Decimal("0.69"),
+            price=PRICE_54_99,
+            unit_price=UNIT_0_69,
             recorded_at=now
         )
 
         assert history.id == 1
         assert history.asin == "B000QSO98W"
-        assert history.price == Decimal("54.99")
+        assert history.price == PRICE_54_99
         assert history.recorded_at == now
 
-    def test_price_history_optional_unit_price(self):
+    def test_price_history_optional_unit_price(self, now):
         """Test price history without unit price"""
-        now = datetime.now()
-
         history = PriceHistoryResponse(
             id=1,
             asin="B000QSO98W",
-            price=Decimal("54.99"),
+            price=PRICE_54_99,
             recorded_at=now
         )
 
@@ -386,10 +367,8 @@ class TestPriceHistoryResponse:
 class TestProductDetailResponse:
     """Tests for ProductDetailResponse schema"""
 
-    def test_product_detail_with_history(self):
+    def test_product_detail_with_history(self, now):
         """Test product detail with price history"""
-        now = datetime.now()
-
         history = [
             PriceHistoryResponse(
                 id=i,
@@ -412,20 +391,9 @@ class TestProductDetailResponse:
         assert len(detail.price_history) == 3
         assert detail.price_history[0].price == Decimal("50.99")
 
-    def test_product_detail_with_similar_products(self):
+    def test_product_detail_with_similar_products(self, now, sample_product_responses):
         """Test product detail with similar products"""
-        now = datetime.now()
-
-        similar = [
-            ProductResponse(
-                asin=f"SIMILAR{i}",
-                title=f"Similar Product {i}",
-                last_scraped_at=now,
-                created_at=now,
-                updated_at=now
-            )
-            for i in range(3)
-        ]
+        similar = sample_product_responses[:3]
 
         detail = ProductDetailResponse(
             asin="B000QSO98W",
@@ -442,13 +410,11 @@ class TestProductDetailResponse:
 class TestCategoryStatsResponse:
     """Tests for CategoryStatsResponse schema"""
 
-    def test_category_stats_response(self):
+    def test_category_stats_response(self, now):
         """Test category stats response"""
-        now = datetime.now()
-
         stats = CategoryStatsResponse(
             category="Protein Powder",
-            median_price=Decimal("54.99"),
+            median_price=PRICE_54_99,
             median_unit_price=Decimal("0.75"),
             avg_rating=Decimal("4.5"),
             product_count=150,
@@ -456,13 +422,11 @@ class TestCategoryStatsResponse:
         )
 
         assert stats.category == "Protein Powder"
-        assert stats.median_price == Decimal("54.99")
+        assert stats.median_price == PRICE_54_99
         assert stats.product_count == 150
 
-    def test_category_stats_minimal(self):
+    def test_category_stats_minimal(self, now):
         """Test category stats with minimal data"""
-        now = datetime.now()
-
         stats = CategoryStatsResponse(
             category="Unknown",
             last_updated=now
@@ -507,22 +471,17 @@ class TestCompareRequest:
 class TestCompareResponse:
     """Tests for CompareResponse schema"""
 
-    def test_compare_response(self):
+    def test_compare_response(self, sample_product_responses):
         """Test compare response"""
-        now = datetime.now()
-
+        # model_copy does not validate the update, so it only carries
+        # values that already have the field types
         products = [
-            ProductResponse(
-                asin=f"TEST{i}",
-                title=f"Product {i}",
-                current_price=Decimal(f"{50 + i}.99"),
-                unit_price=Decimal(f"{0.60 + i * 0.1}"),
-                rating=Decimal(f"{4.0 + i * 0.1}"),
-                last_scraped_at=now,
-                created_at=now,
-                updated_at=now
-            )
-            for i in range(3)
+            product.model_copy(update={
+                "current_price": Decimal(f"{50 + i}.99"),
+                "unit_price": Decimal(f"{0.60 + i * 0.1}"),
+                "rating": Decimal(f"{4.0 + i * 0.1}")
+            })
+            for i, product in enumerate(sample_product_responses[:3])
         ]
 
         response = CompareResponse(
@@ -548,47 +507,38 @@ class TestCompareResponse:
 class TestSchemaEdgeCases:
     """Tests for edge cases and boundary conditions"""
 
-    def test_very_large_numbers(self):
-        """Test handling of very large numbers"""
-        product = ProductBase(
-            asin="TEST",
-            title="Test",
-            current_price=Decimal("999999.99"),
-            review_count=9999999
-        )
-
-        assert product.current_price == Decimal("999999.99")
-        assert product.review_count == 9999999
-
-    def test_very_small_decimals(self):
-        """Test handling of very small decimal values"""
-        product = ProductBase(
-            asin="TEST",
-            title="Test",
-            unit_price=Decimal("0.0001"),
-            rating=Decimal("0.1")
-        )
-
-        assert product.unit_price == Decimal("0.0001")
-
-    def test_special_characters_in_strings(self):
-        """Test handling of special characters"""
-        product = ProductBase(
-            asin="TEST",
-            title="Product with 'quotes' and \"double quotes\" & symbols!",
-            brand="Brand™ Name®"
-        )
-
-        assert "quotes" in product.title
-        assert "™" in product.brand
-
-    def test_unicode_characters(self):
-        """Test handling of unicode characters"""
-        product = ProductBase(
-            asin="TEST",
-            title="Café Latté Protein 日本語",
-            brand="Müller"
-        )
-
-        assert "Café" in product.title
-        assert "Müller" == product.brand
+    @pytest.mark.parametrize("kwargs, checks", [
+        # Very large numbers
+        (
+            {"current_price": Decimal("999999.99"), "review_count": 9999999},
+            [
+                lambda p: p.current_price == Decimal("999999.99"),
+                lambda p: p.review_count == 9999999,
+            ],
+        ),
+        # Very small decimal values
+        (
+            {"unit_price": Decimal("0.0001"), "rating": Decimal("0.1")},
+            [lambda p: p.unit_price == Decimal("0.0001")],
+        ),
+        # Special characters
+        (
+            {
+                "title": "Product with 'quotes' and \"double quotes\" & symbols!",
+                "brand": "Brand™ Name®"
+            },
+            [lambda p: "quotes" in p.title, lambda p: "™" in p.brand],
+        ),
+        # Unicode characters
+        (
+            {"title": "Café Latté Protein 日本語", "brand": "Müller"},
+            [lambda p: "Café" in p.title, lambda p: "Müller" == p.brand],
+        ),
+    ], ids=["very_large_numbers", "very_small_decimals",
+            "special_characters_in_strings", "unicode_characters"])
+    def test_edge_case_values(self, kwargs, checks):
+        """Test that boundary and unusual field values round-trip"""
+        product = ProductBase(**{**EDGE_CASE_BASE, **kwargs})
+
+        for check in checks:
+            assert check(product)
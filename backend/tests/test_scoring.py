@@ -6,6 +6,14 @@ from decimal import Decimal
 from datetime import datetime, timedelta
 
 from app.scoring import ProductScorer
+from tests._constants import PRICE_49_99, UNIT_0_50, UNIT_0_60, UNIT_0_80, UNIT_1_00
+
+
+# Price histories for the price performance tests, built once at import
+_NOW = datetime.now()
+_HISTORY_DATES = [_NOW - timedelta(days=d) for d in (90, 60, 30, 1)]
+_HISTORY_LOW = list(zip((60.0, 55.0, 52.0, 50.0), _HISTORY_DATES))
+_HISTORY_HIGH = list(zip((50.0, 52.0, 55.0, 60.0), _HISTORY_DATES))
 
 
 class TestHiddenGemScore:
@@ -17,8 +25,8 @@ class TestHiddenGemScore:
             rating=Decimal("4.7"),
             review_count=5000,
             search_position=50,  # Page 5
-            unit_price=Decimal("0.50"),
-            category_median_unit_price=Decimal("0.80"),  # 37.5% cheaper
+            unit_price=UNIT_0_50,
+            category_median_unit_price=UNIT_0_80,  # 37.5% cheaper
             is_sponsored=False,
             sponsored_frequency=0.05
         )
@@ -33,8 +41,8 @@ class TestHiddenGemScore:
             rating=Decimal("3.0"),
             review_count=100,
             search_position=10,
-            unit_price=Decimal("1.00"),
-            category_median_unit_price=Decimal("0.80"),  # More expensive
+            unit_price=UNIT_1_00,
+            category_median_unit_price=UNIT_0_80,  # More expensive
             is_sponsored=True,
             sponsored_frequency=0.8
         )
@@ -47,8 +55,8 @@ class TestHiddenGemScore:
             rating=Decimal("4.5"),
             review_count=1000,
             search_position=25,
-            unit_price=Decimal("0.60"),
-            category_median_unit_price=Decimal("0.80"),
+            unit_price=UNIT_0_60,
+            category_median_unit_price=UNIT_0_80,
             is_sponsored=False,
             sponsored_frequency=0.0
         )
@@ -57,14 +65,28 @@ class TestHiddenGemScore:
             rating=Decimal("4.5"),
             review_count=1000,
             search_position=25,
-            unit_price=Decimal("0.60"),
-            category_median_unit_price=Decimal("0.80"),
+            unit_price=UNIT_0_60,
+            category_median_unit_price=UNIT_0_80,
             is_sponsored=True,
             sponsored_frequency=0.9
         )
 
         assert score_not_sponsored > score_sponsored
 
+    def test_price_bonus_exact_discount(self):
+        """Test that an exact 30% discount earns the full price bonus"""
+        score = ProductScorer.calculate_hidden_gem_score(
+            rating=None,
+            review_count=0,
+            search_position=20,  # No position bonus
+            unit_price=Decimal("0.56"),
+            category_median_unit_price=UNIT_0_80,  # Exactly 30% cheaper
+            is_sponsored=True,
+            sponsored_frequency=1.0
+        )
+
+        assert score == 30
+
 
 class TestDealQualityScore:
     """Test deal quality scoring algorithm"""
@@ -73,7 +95,7 @@ class TestDealQualityScore:
         """Test that perfect deals get high scores"""
         score = ProductScorer.calculate_deal_quality_score(
             unit_price=Decimal("0.40"),
-            category_median_unit_price=Decimal("0.80"),  # 50% cheaper
+            category_median_unit_price=UNIT_0_80,  # 50% cheaper
             discount_pct=Decimal("50.0"),
             rating=Decimal("5.0"),
             review_count=10000,
@@ -86,7 +108,7 @@ class TestDealQualityScore:
         """Test that average deals get medium scores"""
         score = ProductScorer.calculate_deal_quality_score(
             unit_price=Decimal("0.75"),
-            category_median_unit_price=Decimal("0.80"),  # Slightly cheaper
+            category_median_unit_price=UNIT_0_80,  # Slightly cheaper
             discount_pct=Decimal("10.0"),
             rating=Decimal("4.0"),
             review_count=500,
@@ -99,7 +121,7 @@ class TestDealQualityScore:
         """Test that poor deals get low scores"""
         score = ProductScorer.calculate_deal_quality_score(
             unit_price=Decimal("1.20"),
-            category_median_unit_price=Decimal("0.80"),  # 50% more expensive
+            category_median_unit_price=UNIT_0_80,  # 50% more expensive
             discount_pct=Decimal("5.0"),
             rating=Decimal("3.0"),
             review_count=10,
@@ -108,23 +130,38 @@ class TestDealQualityScore:
 
         assert score < 40
 
+    @pytest.mark.parametrize("unit_price,median,expected", [
+        ("0.56", "0.80", 40),  # Exactly 0.7 of the median
+        ("0.07", "0.10", 40),
+        ("0.49", "0.70", 40),
+        ("0.60", "0.80", 35),
+        ("0.72", "0.80", 30),  # Exactly 0.9 of the median
+        ("0.27", "0.30", 30),
+        ("0.80", "0.80", 25),
+        ("0.96", "0.80", 15),  # Above median decays linearly
+    ])
+    def test_unit_price_tier_boundaries(self, unit_price, median, expected):
+        """Test that ratios landing on a tier boundary stay in that tier"""
+        score = ProductScorer.calculate_deal_quality_score(
+            unit_price=Decimal(unit_price),
+            category_median_unit_price=Decimal(median),
+            discount_pct=None,
+            rating=None,
+            review_count=0,
+            is_prime=False
+        )
+
+        assert score == expected
+
 
 class TestPricePerformanceScore:
     """Test price performance scoring"""
 
     def test_at_lowest_price_gets_high_score(self):
         """Test that all-time low prices get high scores"""
-        now = datetime.now()
-        price_history = [
-            (60.0, now - timedelta(days=90)),
-            (55.0, now - timedelta(days=60)),
-            (52.0, now - timedelta(days=30)),
-            (50.0, now - timedelta(days=1)),
-        ]
-
         score = ProductScorer.calculate_price_performance_score(
-            current_price=Decimal("49.99"),  # New low
-            price_history=price_history,
+            current_price=PRICE_49_99,  # New low
+            price_history=_HISTORY_LOW,
             days=90
         )
 
@@ -132,22 +169,66 @@ class TestPricePerformanceScore:
 
     def test_at_highest_price_gets_low_score(self):
         """Test that high prices get low scores"""
-        now = datetime.now()
-        price_history = [
-            (50.0, now - timedelta(days=90)),
-            (52.0, now - timedelta(days=60)),
-            (55.0, now - timedelta(days=30)),
-            (60.0, now - timedelta(days=1)),
-        ]
-
         score = ProductScorer.calculate_price_performance_score(
             current_price=Decimal("65.00"),  # New high
-            price_history=price_history,
+            price_history=_HISTORY_HIGH,
             days=90
         )
 
         assert score <= 20
 
+    def test_parallel_price_and_date_sequences(self):
+        """Test that parallel prices/dates score like a list of tuples"""
+        now = datetime.now()
+        prices = [60.0, 55.0, 52.0, 50.0]
+        dates = [now - timedelta(days=d) for d in (90, 60, 30, 1)]
+
+        score = ProductScorer.calculate_price_performance_score(
+            current_price=Decimal("52.00"),
+            prices=prices,
+            dates=dates,
+            days=90
+        )
+
+        assert score == ProductScorer.calculate_price_performance_score(
+            current_price=Decimal("52.00"),
+            price_history=list(zip(prices, dates)),
+            days=90
+        )
+
+    @pytest.mark.parametrize("kwargs", [
+        {"prices": [50.0]},
+        {"dates": [_NOW]},
+        {"price_history": _HISTORY_LOW, "prices": [50.0], "dates": [_NOW]},
+    ], ids=["prices_only", "dates_only", "mixed_with_history"])
+    def test_invalid_history_arguments(self, kwargs):
+        """Test that mismatched history arguments are rejected"""
+        with pytest.raises(ValueError):
+            ProductScorer.calculate_price_performance_score(
+                current_price=Decimal("50.00"),
+                **kwargs
+            )
+
+    def test_empty_parallel_sequences(self):
+        """Test that empty prices/dates give the neutral score"""
+        score = ProductScorer.calculate_price_performance_score(
+            current_price=Decimal("50.00"),
+            prices=[],
+            dates=[]
+        )
+
+        assert score == 50
+
+    def test_tuple_of_price_date_pairs(self):
+        """Test that a tuple of (price, date) pairs is read as history"""
+        score = ProductScorer.calculate_price_performance_score(
+            current_price=Decimal("50.00"),
+            price_history=tuple(_HISTORY_LOW),
+            days=90
+        )
+
+        assert score == 100
+
 
 class TestTrueDiscountValidator:
     """Test discount validation"""
@@ -162,7 +243,7 @@ class TestTrueDiscountValidator:
         ]
 
         result = ProductScorer.is_true_discount(
-            current_price=Decimal("49.99"),
+            current_price=PRICE_49_99,
             list_price=Decimal("69.99"),
             price_history=price_history
         )
@@ -180,7 +261,7 @@ class TestTrueDiscountValidator:
         ]
 
         result = ProductScorer.is_true_discount(
-            current_price=Decimal("49.99"),
+            current_price=PRICE_49_99,
             list_price=Decimal("99.99"),  # Fake - never sold this high
             price_history=price_history
         )
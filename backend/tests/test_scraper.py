@@ -8,12 +8,70 @@ This module tests:
 4. Sponsored detection logic
 5. Product data extraction
 """
+import re
 import pytest
+from dataclasses import dataclass, field
 from unittest.mock import Mock, patch, MagicMock
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, Tag
 from decimal import Decimal
 
-from app.scraper import AmazonScraper, MockAmazonScraper
+from app.scraper import (
+    AmazonScraper, MockAmazonScraper, _PRICE_RE, _RATING_RE, _REVIEW_RE,
+    _SPONSORED_CANDIDATES_SEL
+)
+
+
+REQUIRED_FIELDS = frozenset({
+    'asin', 'title', 'brand', 'current_price', 'list_price',
+    'discount_pct', 'unit_price', 'unit_type', 'quantity',
+    'rating', 'review_count', 'image_url', 'amazon_url',
+    'is_prime', 'is_sponsored', 'in_stock'
+})
+
+# Immutable page payload shared by the integration tests
+_PAGE = (
+    {'asin': 'TEST1', 'title': 'Product 1'},
+    {'asin': 'TEST2', 'title': 'Product 2'},
+)
+
+SAMPLE_CARD_HTML = """
+<div data-asin="B000QSO98W" data-component-type="s-search-result">
+  <h2><a href="/dp/B000QSO98W"><span>Test Product 5lb</span></a></h2>
+  <span class="a-price"><span class="a-offscreen">$54.99</span></span>
+  <span class="a-price" data-a-strike="true"><span class="a-offscreen">$69.99</span></span>
+  <i class="a-icon-star-small"><span class="a-icon-alt">4.6 out of 5 stars</span></i>
+  <span aria-label="12,403 ratings with 4.6 stars"></span>
+  <img class="s-image" src="https://example.com/image.jpg">
+  <i aria-label="Amazon Prime"></i>
+</div>
+"""
+
+
+@dataclass
+class FakeTag:
+    """Minimal stand-in for a bs4 Tag exposing only get and select_one"""
+    data: dict = field(default_factory=dict)
+    children: dict = field(default_factory=dict)
+    text: str = ""
+
+    def get(self, key, default=None):
+        return self.data.get(key, default)
+
+    def select_one(self, selector):
+        return self.children.get(selector)
+
+    def select(self, selector):
+        child = self.children.get(selector)
+        return [] if child is None else [child]
+
+    def get_text(self, strip=False):
+        return self.text.strip() if strip else self.text
+
+
+@pytest.fixture(scope="module")
+def sample_card():
+    """Amazon-style search result card parsed once per module"""
+    return BeautifulSoup(SAMPLE_CARD_HTML, "lxml").select_one("[data-asin]")
 
 
 class TestMockAmazonScraper:
@@ -25,20 +83,18 @@ class TestMockAmazonScraper:
         assert scraper is not None
         assert isinstance(scraper, AmazonScraper)
 
-    def test_mock_search_returns_data(self):
+    def test_mock_search_returns_data(self, mock_scraper):
         """Test that mock search returns product data"""
-        scraper = MockAmazonScraper()
-        results = scraper.search(query="protein", pages=1)
+        results = mock_scraper.search(query="protein", pages=1)
 
         assert len(results) > 0
         assert isinstance(results, list)
         assert all(isinstance(p, dict) for p in results)
 
-    def test_mock_search_includes_query(self):
+    def test_mock_search_includes_query(self, mock_scraper):
         """Test that mock results include the search query in title"""
-        scraper = MockAmazonScraper()
         query = "chocolate"
-        results = scraper.search(query=query, pages=1)
+        results = mock_scraper.search(query=query, pages=1)
 
         assert len(results) > 0
         # Query should be incorporated into product titles
@@ -46,35 +102,24 @@ class TestMockAmazonScraper:
             assert 'title' in product
             assert query in product['title'].lower()
 
-    def test_mock_search_multiple_pages(self):
+    def test_mock_search_multiple_pages(self, mock_search):
         """Test that pages parameter affects result count"""
-        scraper = MockAmazonScraper()
-
-        results_1_page = scraper.search(query="protein", pages=1)
-        results_3_pages = scraper.search(query="protein", pages=3)
+        results_1_page = mock_search("protein", 1)
+        results_3_pages = mock_search("protein", 3)
 
         assert len(results_3_pages) == len(results_1_page) * 3
 
-    def test_mock_product_structure(self):
+    def test_mock_product_structure(self, mock_search):
         """Test that mock products have all required fields"""
-        scraper = MockAmazonScraper()
-        results = scraper.search(query="protein", pages=1)
-
-        required_fields = [
-            'asin', 'title', 'brand', 'current_price', 'list_price',
-            'discount_pct', 'unit_price', 'unit_type', 'quantity',
-            'rating', 'review_count', 'image_url', 'amazon_url',
-            'is_prime', 'is_sponsored', 'in_stock'
-        ]
+        results = mock_search("protein", 1)
 
         for product in results:
-            for field in required_fields:
-                assert field in product, f"Missing field: {field}"
+            missing = REQUIRED_FIELDS - product.keys()
+            assert not missing, f"Missing fields: {sorted(missing)}"
 
-    def test_mock_product_types(self):
+    def test_mock_product_types(self, mock_search):
         """Test that mock product fields have correct types"""
-        scraper = MockAmazonScraper()
-        results = scraper.search(query="protein", pages=1)
+        results = mock_search("protein", 1)
         product = results[0]
 
         assert isinstance(product['asin'], str)
@@ -85,10 +130,9 @@ class TestMockAmazonScraper:
         assert isinstance(product['is_prime'], bool)
         assert isinstance(product['is_sponsored'], bool)
 
-    def test_mock_sponsored_and_non_sponsored(self):
+    def test_mock_sponsored_and_non_sponsored(self, mock_search):
         """Test that mock data includes both sponsored and organic results"""
-        scraper = MockAmazonScraper()
-        results = scraper.search(query="protein", pages=1)
+        results = mock_search("protein", 1)
 
         has_sponsored = any(p['is_sponsored'] for p in results)
         has_organic = any(not p['is_sponsored'] for p in results)
@@ -100,28 +144,28 @@ class TestMockAmazonScraper:
 class TestAmazonScraperParsing:
     """Tests for AmazonScraper parsing methods"""
 
-    def test_parse_price_standard(self):
-        """Test parsing standard price format"""
-        assert AmazonScraper._parse_price("$54.99") == 54.99
-        assert AmazonScraper._parse_price("$123.45") == 123.45
-        assert AmazonScraper._parse_price("$9.99") == 9.99
-
-    def test_parse_price_without_dollar_sign(self):
-        """Test parsing price without dollar sign"""
-        assert AmazonScraper._parse_price("54.99") == 54.99
-        assert AmazonScraper._parse_price("123") == 123.0
-
-    def test_parse_price_with_commas(self):
-        """Test parsing price with comma separators"""
-        assert AmazonScraper._parse_price("$1,234.56") == 1234.56
-        assert AmazonScraper._parse_price("$10,000.00") == 10000.0
-
-    def test_parse_price_edge_cases(self):
-        """Test price parsing edge cases"""
-        assert AmazonScraper._parse_price("") is None
-        assert AmazonScraper._parse_price(None) is None
-        assert AmazonScraper._parse_price("invalid") is None
-        assert AmazonScraper._parse_price("$") is None
+    @pytest.mark.parametrize("text,expected", [
+        # Standard format
+        ("$54.99", 54.99),
+        ("$123.45", 123.45),
+        ("$9.99", 9.99),
+        # Without dollar sign
+        ("54.99", 54.99),
+        ("123", 123.0),
+        # Comma separators
+        ("$1,234.56", 1234.56),
+        ("$10,000.00", 10000.0),
+        # Leading decimal point
+        (".99", 0.99),
+        # Edge cases
+        ("", None),
+        (None, None),
+        ("invalid", None),
+        ("$", None),
+    ])
+    def test_parse_price(self, text, expected):
+        """Test parsing price text"""
+        assert AmazonScraper._parse_price(text) == expected
 
     def test_parse_price_multiple_decimals(self):
         """Test price with multiple decimal points (invalid)"""
@@ -129,180 +173,124 @@ class TestAmazonScraperParsing:
         result = AmazonScraper._parse_price("$12.34.56")
         assert result is None or isinstance(result, float)
 
-    def test_parse_rating_standard(self):
-        """Test parsing standard rating format"""
-        assert AmazonScraper._parse_rating("4.6 out of 5 stars") == 4.6
-        assert AmazonScraper._parse_rating("4.5 out of 5 stars") == 4.5
-        assert AmazonScraper._parse_rating("3.0 out of 5 stars") == 3.0
-
-    def test_parse_rating_short_format(self):
-        """Test parsing short rating format"""
-        assert AmazonScraper._parse_rating("4.6") == 4.6
-        assert AmazonScraper._parse_rating("5.0") == 5.0
-        assert AmazonScraper._parse_rating("1") == 1.0
-
-    def test_parse_rating_edge_cases(self):
-        """Test rating parsing edge cases"""
-        assert AmazonScraper._parse_rating("") is None
-        assert AmazonScraper._parse_rating(None) is None
-        assert AmazonScraper._parse_rating("no rating") is None
-
-    def test_parse_review_count_standard(self):
-        """Test parsing standard review count"""
-        assert AmazonScraper._parse_review_count("12,403 ratings") == 12403
-        assert AmazonScraper._parse_review_count("1,234") == 1234
-        assert AmazonScraper._parse_review_count("500") == 500
-
-    def test_parse_review_count_large_numbers(self):
-        """Test parsing large review counts"""
-        assert AmazonScraper._parse_review_count("124,030") == 124030
-        assert AmazonScraper._parse_review_count("1,234,567") == 1234567
-
-    def test_parse_review_count_without_commas(self):
-        """Test parsing review count without commas"""
-        assert AmazonScraper._parse_review_count("12403") == 12403
-        assert AmazonScraper._parse_review_count("500") == 500
-
-    def test_parse_review_count_edge_cases(self):
-        """Test review count parsing edge cases"""
-        assert AmazonScraper._parse_review_count("") is None
-        assert AmazonScraper._parse_review_count(None) is None
-        assert AmazonScraper._parse_review_count("no reviews") is None
+    def test_regexes_are_compiled_once(self):
+        """Test that parsing patterns are precompiled at module level"""
+        for pattern in (_PRICE_RE, _RATING_RE, _REVIEW_RE):
+            assert isinstance(pattern, re.Pattern)
+
+    @pytest.mark.parametrize("text,expected", [
+        # Standard format
+        ("4.6 out of 5 stars", 4.6),
+        ("4.5 out of 5 stars", 4.5),
+        ("3.0 out of 5 stars", 3.0),
+        # Short format
+        ("4.6", 4.6),
+        ("5.0", 5.0),
+        ("1", 1.0),
+        # Edge cases
+        ("", None),
+        (None, None),
+        ("no rating", None),
+    ])
+    def test_parse_rating(self, text, expected):
+        """Test parsing rating text"""
+        assert AmazonScraper._parse_rating(text) == expected
+
+    @pytest.mark.parametrize("text,expected", [
+        # Standard format
+        ("12,403 ratings", 12403),
+        ("1,234", 1234),
+        ("500", 500),
+        # Large numbers
+        ("124,030", 124030),
+        ("1,234,567", 1234567),
+        # Without commas
+        ("12403", 12403),
+        # Edge cases
+        ("", None),
+        (None, None),
+        ("no reviews", None),
+    ])
+    def test_parse_review_count(self, text, expected):
+        """Test parsing review count text"""
+        assert AmazonScraper._parse_review_count(text) == expected
 
 
 class TestAmazonScraperSponsoredDetection:
     """Tests for sponsored product detection"""
 
-    def test_is_sponsored_data_attribute(self):
+    def test_is_sponsored_data_attribute(self, scraper):
         """Test sponsored detection via data attribute"""
-        scraper = AmazonScraper()
-
         # Create mock element with sponsored attribute
-        mock_card = Mock()
+        mock_card = Mock(spec=Tag)
         mock_card.get.return_value = 'sp-sponsored-result'
-        mock_card.select_one.return_value = None
-
-        assert scraper._is_sponsored(mock_card) is True
-
-    def test_is_sponsored_badge_text(self):
-        """Test sponsored detection via badge text"""
-        scraper = AmazonScraper()
-
-        # Create mock element with sponsored badge
-        mock_card = Mock()
-        mock_card.get.side_effect = lambda x: None if x == 'data-component-type' else []
-
-        mock_badge = Mock()
-        mock_badge.get_text.return_value = "Sponsored"
-        mock_card.select_one.return_value = mock_badge
+        mock_card.select.return_value = []
 
         assert scraper._is_sponsored(mock_card) is True
 
-    def test_is_sponsored_adholder_class(self):
+    def test_is_sponsored_adholder_class(self, scraper):
         """Test sponsored detection via AdHolder class"""
-        scraper = AmazonScraper()
-
         # Create mock element with AdHolder class
-        mock_card = Mock()
-        mock_card.get.side_effect = lambda x: ['AdHolder', 'other-class'] if x == 'class' else None
-        mock_card.select_one.return_value = None
+        mock_card = Mock(spec=Tag)
+        mock_card.get.side_effect = lambda x, default=None: ['AdHolder', 'other-class'] if x == 'class' else default
+        mock_card.select.return_value = []
 
         assert scraper._is_sponsored(mock_card) is True
 
-    def test_is_not_sponsored(self):
+    def test_is_not_sponsored(self, scraper):
         """Test organic (non-sponsored) product detection"""
-        scraper = AmazonScraper()
-
         # Create mock element without sponsored indicators
-        mock_card = Mock()
-        mock_card.get.side_effect = lambda x: [] if x == 'class' else None
-        mock_card.select_one.return_value = None
+        mock_card = Mock(spec=Tag)
+        mock_card.get.side_effect = lambda x, default=None: [] if x == 'class' else default
+        mock_card.select.return_value = []
 
         assert scraper._is_sponsored(mock_card) is False
+        # Organic cards cost a single descendant walk
+        mock_card.select.assert_called_once_with(_SPONSORED_CANDIDATES_SEL)
+        assert not mock_card.select_one.called
+
+    @pytest.mark.parametrize("inner,expected", [
+        ('<span class="s-label-popover-default"><span>Sponsored</span></span>', True),
+        ('<span class="s-label-popover-default">SPONSORED</span>', True),
+        ('<span class="s-label-popover-default">sPoNsOrEd</span>', True),
+        ('<span class="puis-sponsored-label-text">Sponsored</span>', True),
+        ('<a aria-label="Sponsored Ad - Whey Protein"></a>', True),
+        ('<span class="s-label-popover-default">Best Seller</span>', False),
+    ])
+    def test_is_sponsored_nested_indicators(self, scraper, inner, expected):
+        """Test sponsored detection from indicators nested in a real card"""
+        card = BeautifulSoup(
+            f'<div data-asin="B000QSO98W">{inner}</div>', "lxml"
+        ).select_one("[data-asin]")
+
+        assert scraper._is_sponsored(card) is expected
 
 
 class TestAmazonScraperExtraction:
     """Tests for product data extraction"""
 
-    def test_extract_product_data_without_asin(self):
+    def test_extract_product_data_without_asin(self, scraper):
         """Test that products without ASIN are skipped"""
-        scraper = AmazonScraper()
-
-        # Create mock card without ASIN
-        mock_card = Mock()
-        mock_card.get.return_value = None
+        # Card without ASIN
+        card = FakeTag()
 
-        result = scraper._extract_product_data(mock_card)
+        result = scraper._extract_product_data(card)
         assert result is None
 
-    def test_extract_product_data_without_title(self):
+    def test_extract_product_data_without_title(self, scraper):
         """Test that products without title are skipped"""
-        scraper = AmazonScraper()
+        # Card with ASIN but no title
+        card = FakeTag(data={'data-asin': "B000QSO98W"})
 
-        # Create mock card with ASIN but no title
-        mock_card = Mock()
-        mock_card.get.return_value = "B000QSO98W"
-        mock_card.select_one.return_value = None
-
-        result = scraper._extract_product_data(mock_card)
+        result = scraper._extract_product_data(card)
         assert result is None
 
     @patch('app.scraper.extract_and_calculate_unit_price')
-    def test_extract_product_data_complete(self, mock_unit_calc):
+    def test_extract_product_data_complete(self, mock_unit_calc, scraper, sample_card):
         """Test extracting complete product data"""
-        scraper = AmazonScraper()
         mock_unit_calc.return_value = (Decimal('0.69'), 'oz', 80.0)
 
-        # Create comprehensive mock card
-        mock_card = Mock()
-        mock_card.get.side_effect = lambda x: "B000QSO98W" if x == 'data-asin' else []
-
-        # Mock title
-        mock_title = Mock()
-        mock_title.get_text.return_value = "Test Product 5lb"
-
-        # Mock price
-        mock_price = Mock()
-        mock_price.get_text.return_value = "$54.99"
-
-        # Mock list price
-        mock_list_price = Mock()
-        mock_list_price.get_text.return_value = "$69.99"
-
-        # Mock rating
-        mock_rating = Mock()
-        mock_rating.get_text.return_value = "4.6 out of 5 stars"
-
-        # Mock review element
-        mock_review = Mock()
-        mock_review.get.return_value = "12,403 ratings"
-
-        # Mock image
-        mock_img = Mock()
-        mock_img.get.return_value = "https://example.com/image.jpg"
-
-        # Setup select_one to return appropriate mocks
-        def select_one_side_effect(selector):
-            if 'h2 a span' in selector:
-                return mock_title
-            elif '.a-price .a-offscreen' in selector:
-                return mock_price
-            elif 'data-a-strike' in selector:
-                return mock_list_price
-            elif '.a-icon-star-small' in selector:
-                return mock_rating
-            elif '[aria-label*="stars"]' in selector:
-                return mock_review
-            elif '.s-image' in selector:
-                return mock_img
-            elif 'Amazon Prime' in selector:
-                return Mock()  # Prime badge exists
-            else:
-                return None
-
-        mock_card.select_one.side_effect = select_one_side_effect
-
-        result = scraper._extract_product_data(mock_card)
+        result = scraper._extract_product_data(sample_card)
 
         assert result is not None
         assert result['asin'] == "B000QSO98W"
@@ -328,8 +316,6 @@ class TestAmazonScraperDiscountCalculation:
 
     def test_discount_calculation(self):
         """Test discount percentage calculation"""
-        scraper = AmazonScraper()
-
         # Manually test discount logic
         current_price = 54.99
         list_price = 69.99
@@ -360,16 +346,16 @@ class TestAmazonScraperDiscountCalculation:
 class TestAmazonScraperIntegration:
     """Integration tests for scraper (requires network or mocking)"""
 
+    @pytest.fixture(autouse=True)
+    def _no_sleep(self, monkeypatch):
+        """Skip the politeness delay between mocked pages"""
+        monkeypatch.setattr("app.scraper.time.sleep", lambda *_: None)
+
     @patch('app.scraper.AmazonScraper._scrape_search_page')
-    def test_search_multiple_pages(self, mock_scrape):
+    def test_search_multiple_pages(self, mock_scrape, scraper):
         """Test searching multiple pages with delay"""
-        scraper = AmazonScraper()
-
         # Mock page results
-        mock_scrape.return_value = [
-            {'asin': 'TEST1', 'title': 'Product 1'},
-            {'asin': 'TEST2', 'title': 'Product 2'}
-        ]
+        mock_scrape.return_value = _PAGE
 
         results = scraper.search(query="test", pages=2, delay=0.01)
 
@@ -377,13 +363,11 @@ class TestAmazonScraperIntegration:
         assert mock_scrape.call_count == 2
 
     @patch('app.scraper.AmazonScraper._scrape_search_page')
-    def test_search_handles_page_errors(self, mock_scrape):
+    def test_search_handles_page_errors(self, mock_scrape, scraper):
         """Test that search continues even if one page fails"""
-        scraper = AmazonScraper()
-
         # First page succeeds, second page fails
         mock_scrape.side_effect = [
-            [{'asin': 'TEST1', 'title': 'Product 1'}],
+            _PAGE[:1],
             Exception("Network error")
         ]
 
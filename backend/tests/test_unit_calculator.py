@@ -5,6 +5,22 @@ import pytest
 from decimal import Decimal
 
 from app.unit_calculator import UnitPriceCalculator, UnitType
+from tests._constants import PRICE_49_99, PRICE_54_99
+
+
+def D(mantissa: int, exp: int = 0) -> Decimal:
+    """Build a non-negative Decimal from its digits without string parsing"""
+    return Decimal((0, tuple(int(c) for c in str(mantissa)), exp))
+
+
+D0 = D(0)
+D1 = D(1)
+D5 = D(5)
+D80 = D(80)
+D100 = D(100)
+PRICE_9_99 = D(999, -2)
+PRICE_19_99 = D(1999, -2)
+PRICE_NEG_19_99 = -PRICE_19_99
 
 
 class TestUnitPriceExtraction:
@@ -53,41 +69,20 @@ class TestUnitPriceExtraction:
 class TestUnitConversion:
     """Test unit conversion to standard units"""
 
-    def test_pounds_to_ounces(self):
-        """Test converting pounds to ounces"""
-        oz = UnitPriceCalculator.convert_to_standard_unit(
-            quantity=Decimal('5'),
-            unit='lb',
-            unit_type=UnitType.WEIGHT
+    @pytest.mark.parametrize("quantity,unit,unit_type,expected", [
+        (D5, 'lb', UnitType.WEIGHT, D80),  # 5 * 16
+        (D1, 'kg', UnitType.WEIGHT, Decimal('35.274')),  # 1 kg = 35.274 oz
+        (D1, 'L', UnitType.VOLUME, Decimal('33.814')),  # 1 L = 33.814 fl oz
+        (D100, 'count', UnitType.COUNT, D100),  # count units don't convert
+    ], ids=["lb_to_oz", "kg_to_oz", "L_to_fl_oz", "count"])
+    def test_convert_to_standard_unit(self, quantity, unit, unit_type, expected):
+        """Test converting quantities to standard units"""
+        converted = UnitPriceCalculator.convert_to_standard_unit(
+            quantity=quantity,
+            unit=unit,
+            unit_type=unit_type
         )
-        assert oz == Decimal('80')  # 5 * 16
-
-    def test_kilograms_to_ounces(self):
-        """Test converting kilograms to ounces"""
-        oz = UnitPriceCalculator.convert_to_standard_unit(
-            quantity=Decimal('1'),
-            unit='kg',
-            unit_type=UnitType.WEIGHT
-        )
-        assert oz == Decimal('35.274')  # 1 kg = 35.274 oz
-
-    def test_liters_to_fluid_ounces(self):
-        """Test converting liters to fluid ounces"""
-        fl_oz = UnitPriceCalculator.convert_to_standard_unit(
-            quantity=Decimal('1'),
-            unit='L',
-            unit_type=UnitType.VOLUME
-        )
-        assert fl_oz == Decimal('33.814')  # 1 L = 33.814 fl oz
-
-    def test_count_no_conversion(self):
-        """Test that count units don't convert"""
-        count = UnitPriceCalculator.convert_to_standard_unit(
-            quantity=Decimal('100'),
-            unit='count',
-            unit_type=UnitType.COUNT
-        )
-        assert count == Decimal('100')
+        assert converted == expected
 
 
 class TestUnitPriceCalculation:
@@ -96,8 +91,8 @@ class TestUnitPriceCalculation:
     def test_calculate_unit_price_weight(self):
         """Test calculating unit price for weight-based product"""
         unit_price = UnitPriceCalculator.calculate_unit_price(
-            price=Decimal('49.99'),
-            quantity=Decimal('80'),  # 5 lb = 80 oz
+            price=PRICE_49_99,
+            quantity=D80,  # 5 lb = 80 oz
             unit='oz'
         )
         assert unit_price == Decimal('0.6249')  # 49.99 / 80
@@ -105,8 +100,8 @@ class TestUnitPriceCalculation:
     def test_calculate_unit_price_count(self):
         """Test calculating unit price for count-based product"""
         unit_price = UnitPriceCalculator.calculate_unit_price(
-            price=Decimal('19.99'),
-            quantity=Decimal('100'),
+            price=PRICE_19_99,
+            quantity=D100,
             unit='count'
         )
         assert unit_price == Decimal('0.1999')  # 19.99 / 100
@@ -114,8 +109,8 @@ class TestUnitPriceCalculation:
     def test_calculate_unit_price_zero_quantity(self):
         """Test that zero quantity returns None"""
         unit_price = UnitPriceCalculator.calculate_unit_price(
-            price=Decimal('19.99'),
-            quantity=Decimal('0'),
+            price=PRICE_19_99,
+            quantity=D0,
             unit='oz'
         )
         assert unit_price is None
@@ -123,8 +118,8 @@ class TestUnitPriceCalculation:
     def test_calculate_unit_price_negative_price(self):
         """Test that negative price returns None"""
         unit_price = UnitPriceCalculator.calculate_unit_price(
-            price=Decimal('-19.99'),
-            quantity=Decimal('100'),
+            price=PRICE_NEG_19_99,
+            quantity=D100,
             unit='count'
         )
         assert unit_price is None
@@ -136,12 +131,12 @@ class TestEndToEndCalculation:
     def test_full_calculation_protein_powder(self):
         """Test complete calculation for protein powder"""
         title = "Optimum Nutrition Whey Protein 5 lb"
-        price = Decimal('54.99')
+        price = PRICE_54_99
 
         result = UnitPriceCalculator.calculate_from_title(title, price)
 
         assert result['unit_price'] is not None
-        assert result['quantity'] == Decimal('80')  # 5 lb = 80 oz
+        assert result['quantity'] == D80  # 5 lb = 80 oz
         assert result['unit'] == 'oz'
         assert result['unit_type'] == UnitType.WEIGHT
         assert result['unit_price'] < Decimal('1.0')  # Should be under $1/oz
@@ -149,19 +144,19 @@ class TestEndToEndCalculation:
     def test_full_calculation_vitamins(self):
         """Test complete calculation for vitamins"""
         title = "Vitamin C 1000mg 100 Count"
-        price = Decimal('19.99')
+        price = PRICE_19_99
 
         result = UnitPriceCalculator.calculate_from_title(title, price)
 
         assert result['unit_price'] is not None
-        assert result['quantity'] == Decimal('100')
+        assert result['quantity'] == D100
         assert result['unit'] == 'count'
         assert result['unit_type'] == UnitType.COUNT
 
     def test_full_calculation_no_unit(self):
         """Test calculation when no unit is found"""
         title = "Generic Product"
-        price = Decimal('9.99')
+        price = PRICE_9_99
 
         result = UnitPriceCalculator.calculate_from_title(title, price)
 